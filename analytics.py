@@ -0,0 +1,367 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+from missions import extend_buffer
+
+# ─── Stage 02: filtering and mission table ────────────────────────────────────
+def filter_missions(df, mission_type="All Types", vehicle="All Vehicles", year_range=None):
+    """Rows of ``df`` matching the Stage 02 selectors ("All ..." disables a selector).
+
+    Reference implementation for ``MissionIndex``: one combined mask, one selection.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    if mission_type != "All Types":
+        mask &= (df["type"] == mission_type).to_numpy()
+    if vehicle != "All Vehicles":
+        mask &= (df["vehicle"] == vehicle).to_numpy()
+    if year_range is not None:
+        years = df["year"].to_numpy()
+        mask &= (years >= year_range[0]) & (years <= year_range[1])
+    return df[mask]
+
+
+class MissionIndex:
+    """Row positions of a missions frame by type, vehicle, year and outcome.
+
+    Each label keeps the rows holding it as an append-only posting list, and
+    each row its label code, so a Stage 02 filter resolves by starting from the
+    smallest matching posting list and checking the other selectors on those
+    rows only, never scanning or copying the frame. ``extended`` indexes
+    appended rows in time proportional to their number and returns a new index,
+    leaving this one valid.
+    """
+
+    KEYS = ("type", "vehicle", "year", "success")
+
+    def __init__(self, df=None):
+        self.n = 0
+        self._codes = {key: np.empty(0, dtype=np.int32) for key in self.KEYS}
+        self._lookup = {key: {} for key in self.KEYS}
+        self._postings = {key: [] for key in self.KEYS}    # per label code: (buffer, size)
+        if df is not None:
+            self._append(df)
+
+    def extended(self, df):
+        out = MissionIndex.__new__(MissionIndex)
+        out.n = self.n
+        out._codes = dict(self._codes)
+        out._lookup = {key: dict(lookup) for key, lookup in self._lookup.items()}
+        out._postings = {key: list(postings) for key, postings in self._postings.items()}
+        out._append(df)
+        return out
+
+    def _append(self, df):
+        rows = np.arange(self.n, self.n + len(df))
+        for key in self.KEYS:
+            labels = pd.Categorical(df[key])
+            lookup, postings = self._lookup[key], self._postings[key]
+            for label in labels.categories:
+                if label not in lookup:
+                    lookup[label] = len(lookup)
+                    postings.append((np.empty(0, dtype=np.intp), 0))
+            codes = np.array([lookup[label] for label in labels.categories], dtype=np.int32)[labels.codes]
+            self._codes[key] = extend_buffer(self._codes[key], self.n, codes)
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(postings) + 1))
+            for code in np.flatnonzero(np.diff(bounds)):
+                buffer, size = postings[code]
+                new = rows[order[bounds[code]:bounds[code + 1]]]
+                postings[code] = (extend_buffer(buffer, size, new), size + len(new))
+        self.n += len(df)
+
+    def _rows(self, key, codes):
+        parts = [self._postings[key][code] for code in codes]
+        if len(parts) == 1:
+            return parts[0][0][:parts[0][1]]
+        return np.concatenate([buffer[:size] for buffer, size in parts] + [np.empty(0, dtype=np.intp)])
+
+    def positions(self, mission_type="All Types", vehicle="All Vehicles", year_range=None, success=None):
+        """Sorted positions of the rows matching the Stage 02 selectors ("All ..." disables a selector).
+
+        ``success`` restricts to successful (``True``) or failed (``False``) missions, as Stage 03 does.
+        """
+        selected = []    # (key, label codes)
+        for key, value, everything in (("type", mission_type, "All Types"), ("vehicle", vehicle, "All Vehicles")):
+            if value == everything:
+                continue
+            if value not in self._lookup[key]:
+                return np.empty(0, dtype=np.intp)
+            selected.append((key, [self._lookup[key][value]]))
+        if year_range is not None:
+            selected.append(("year", [code for year, code in self._lookup["year"].items()
+                                      if year_range[0] <= year <= year_range[1]]))
+        if success is not None:
+            selected.append(("success", [code for label, code in self._lookup["success"].items()
+                                         if label == success]))
+        if not selected:
+            return np.arange(self.n)
+
+        sizes = [sum(self._postings[key][code][1] for code in codes) for key, codes in selected]
+        smallest = int(np.argmin(sizes))
+        rows = self._rows(*selected[smallest])
+        keep = np.ones(rows.size, dtype=bool)
+        for i, (key, codes) in enumerate(selected):
+            if i != smallest:
+                found = self._codes[key][rows]
+                keep &= found == codes[0] if len(codes) == 1 else np.isin(found, codes)
+        return np.sort(rows[keep])
+
+
+class KpiCube:
+    """Stage 02 KPI totals pre-aggregated over type × vehicle × year.
+
+    ``cells[m, t, v, y]`` holds measure ``m`` of ``MEASURES`` for one type,
+    vehicle and year, so a filter's metric cards are the sum of one slice of
+    the cube, whatever the number of rows. ``append`` folds new rows in,
+    growing the cube for labels or years it has not seen yet.
+    """
+
+    MEASURES = ("count", "success", "cost", "duration")
+
+    def __init__(self, df=None):
+        self.types, self.vehicles = {}, {}
+        self.first_year = 0
+        self.cells = np.zeros((len(self.MEASURES), 0, 0, 0))
+        if df is not None:
+            self.append(df)
+
+    @staticmethod
+    def _codes(lookup, values):
+        # Cube positions for ``values``, registering labels seen for the first time
+        labels = pd.Categorical(values)
+        for label in labels.categories:
+            lookup.setdefault(label, len(lookup))
+        return np.array([lookup[label] for label in labels.categories], dtype=np.intp)[labels.codes]
+
+    def append(self, df):
+        if len(df) == 0:
+            return
+        t = self._codes(self.types, df["type"])
+        v = self._codes(self.vehicles, df["vehicle"])
+        years = df["year"].to_numpy(dtype=np.int64)
+        n_years = self.cells.shape[3]
+        first = int(years.min()) if n_years == 0 else min(self.first_year, int(years.min()))
+        last = int(years.max()) if n_years == 0 else max(self.first_year + n_years - 1, int(years.max()))
+
+        shape = (len(self.types), len(self.vehicles), last - first + 1)
+        if shape != self.cells.shape[1:]:
+            grown = np.zeros((len(self.MEASURES),) + shape)
+            _, old_t, old_v, old_y = self.cells.shape
+            shift = self.first_year - first
+            grown[:, :old_t, :old_v, shift:shift + old_y] = self.cells
+            self.cells, self.first_year = grown, first
+
+        flat = np.ravel_multi_index((t, v, years - first), shape)
+        size = int(np.prod(shape))
+        weights = (None, df["success"].to_numpy(dtype=np.float64), df["cost"].to_numpy(dtype=np.float64),
+                   df["duration"].to_numpy(dtype=np.float64))
+        for m, w in enumerate(weights):
+            self.cells[m] += np.bincount(flat, weights=w, minlength=size).reshape(shape)
+
+    def extended(self, df):
+        """A cube that also counts ``df``; the cube is small, so copying it is cheap."""
+        out = copy.deepcopy(self)
+        out.append(df)
+        return out
+
+    def kpis(self, mission_type="All Types", vehicle="All Vehicles", year_range=None):
+        """Missions, success rate (%), average cost and average duration for a Stage 02 selection.
+
+        Returns ``None`` when no mission matches.
+        """
+        block = self.cells
+        for axis, lookup, value, everything in ((1, self.types, mission_type, "All Types"),
+                                                (2, self.vehicles, vehicle, "All Vehicles")):
+            if value == everything:
+                continue
+            if value not in lookup:
+                return None
+            block = np.take(block, [lookup[value]], axis=axis)
+        if year_range is not None:
+            lo = max(year_range[0] - self.first_year, 0)
+            hi = max(year_range[1] - self.first_year + 1, 0)
+            block = block[..., lo:hi]
+        count, success, cost, duration = block.reshape(len(self.MEASURES), -1).sum(axis=1)
+        if count == 0:
+            return None
+        return {
+            "missions": int(count),
+            "success_rate": success / count * 100,
+            "avg_cost": cost / count,
+            "avg_duration": duration / count,
+        }
+
+
+TABLE_COLUMNS = {
+    "Mission Name":    "mission",
+    "Type":            "type",
+    "Cost ($M)":       "cost",
+    "Payload (kg)":    "payload",
+    "Fuel (L)":        "fuel",
+    "Duration (days)": "duration",
+    "Success":         "success",
+    "Year":            "year",
+}
+
+
+def sort_rows(df, positions, column, descending=False):
+    """``positions`` reordered by ``df[column]``; ties keep their row order."""
+    values = df[column]
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Codes follow category order, not the labels' alphabetical order
+        rank = np.argsort(np.argsort(values.cat.categories.astype(str)))
+        keys = rank[values.cat.codes.to_numpy()[positions]]
+    elif values.dtype == object or pd.api.types.is_string_dtype(values):
+        keys = pd.factorize(values.to_numpy()[positions], sort=True)[0]
+    else:
+        keys = values.to_numpy()[positions]
+    keys = keys.astype(np.int64) if keys.dtype.kind in "biu" else keys.astype(np.float64)
+    return positions[np.argsort(-keys if descending else keys, kind="stable")]
+
+
+def _escape(text):
+    return text.str.replace("&", "&amp;").str.replace("<", "&lt;").str.replace(">", "&gt;")
+
+
+def _thousands(values):
+    return values.astype(str).str.replace(r"\B(?=(\d{3})+(?!\d))", ",", regex=True)
+
+
+def mission_table_html(df):
+    """Render missions as the ``.custom-table`` HTML used on Stage 02.
+
+    Cells are built column-at-a-time with vectorized string operations; pass
+    only the rows on screen.
+    """
+    ok = df["success"].to_numpy(dtype=bool)
+    s_color = pd.Series(np.where(ok, "#00c8ff", "#ff4466"), index=df.index)
+    s_bg    = pd.Series(np.where(ok, "rgba(0,200,255,0.08)", "rgba(255,60,100,0.08)"), index=df.index)
+    s_border = s_color + "40"
+    type_val    = _escape(df["type"].astype(str).str.upper())
+    mission_val = _escape(df["mission"].astype(str))
+    cost_val    = "$" + df["cost"].astype(str) + "M"
+    payload_val = _thousands(df["payload"])
+    fuel_val    = _thousands(df["fuel"])
+    dur_val     = df["duration"].astype(str)
+    succ_val    = pd.Series(np.where(ok, "YES", "NO"), index=df.index)
+    year_val    = df["year"].astype(str)
+
+    rows = (
+        '<tr class="data-row">'
+        '<td style="font-weight:600;color:#c8d8f0;">' + mission_val + '</td>'
+        '<td><span style="background:rgba(0,100,200,0.15);border:1px solid rgba(0,120,255,0.2);border-radius:4px;padding:3px 10px;font-size:12px;color:#80b0ff;font-family:Share Tech Mono,monospace;letter-spacing:1px;">' + type_val + '</span></td>'
+        '<td style="color:#a0c8ff;font-family:Share Tech Mono,monospace;">' + cost_val + '</td>'
+        '<td style="color:#c8d8f0;font-family:Share Tech Mono,monospace;">' + payload_val + '</td>'
+        '<td style="color:#c8d8f0;font-family:Share Tech Mono,monospace;">' + fuel_val + '</td>'
+        '<td style="color:#c8d8f0;font-family:Share Tech Mono,monospace;">' + dur_val + '</td>'
+        '<td><span style="background:' + s_bg + ';border:1px solid ' + s_border + ';border-radius:4px;padding:3px 10px;font-size:12px;color:' + s_color + ';font-family:Share Tech Mono,monospace;font-weight:700;">' + succ_val + '</span></td>'
+        '<td style="color:rgba(160,196,255,0.6);font-family:Share Tech Mono,monospace;">' + year_val + '</td>'
+        '</tr>'
+    )
+
+    return (
+        '<div class="custom-table-wrap">'
+        '<table class="custom-table">'
+        '<thead><tr>'
+        + "".join(f"<th>{label}</th>" for label in TABLE_COLUMNS) +
+        '</tr></thead>'
+        '<tbody>' + "".join(rows.tolist()) + '</tbody>'
+        '</table></div>'
+    )
+
+
+# ─── Stage 03: correlations ───────────────────────────────────────────────────
+CORR_COLUMNS = ("cost", "payload", "fuel", "duration", "crew", "distance", "year", "success")
+CORR_METHODS = ("pearson", "spearman")
+CORR_PAIRS = [
+    ("cost", "payload"), ("cost", "fuel"), ("cost", "duration"),
+    ("payload", "fuel"), ("payload", "duration"), ("fuel", "duration"),
+]
+
+
+def correlation_matrix(df, method="pearson", columns=CORR_COLUMNS):
+    """Correlation of every pair of ``columns`` as a labelled square frame.
+
+    All pairs come from one product of the standardised (rows x columns) matrix,
+    so the data is read once however many columns there are. ``"spearman"`` is
+    Pearson on average ranks. A constant column, or fewer than two rows,
+    correlates 0 with everything else.
+    """
+    if method not in CORR_METHODS:
+        raise ValueError(f"unknown correlation method {method!r}")
+    columns = list(columns)
+    # Filled column by column: ranking or converting the mixed-dtype frame as a whole is several times slower
+    x = np.empty((len(df), len(columns)))
+    for j, name in enumerate(columns):
+        x[:, j] = df[name].rank().to_numpy() if method == "spearman" else df[name].to_numpy()
+    products = np.zeros((len(columns), len(columns)))
+    if len(x) >= 2:
+        x -= x.mean(axis=0)
+        products = x.T @ x
+    return correlation_from_products(products, columns)
+
+
+def correlation_from_products(products, columns):
+    """Correlation frame from the cross-products of mean-centred ``columns``.
+
+    ``products[i, j]`` is the sum over rows of (x_i - mean_i)(x_j - mean_j),
+    as ``MissionStore.correlations`` aggregates it in SQL, so the store and
+    ``correlation_matrix`` agree. A column with no spread correlates 0.
+    """
+    products = np.asarray(products, dtype=np.float64)
+    norms = np.sqrt(np.diag(products))
+    norms = np.where(norms > 0, norms, 1.0)
+    corr = np.clip(products / np.outer(norms, norms), -1.0, 1.0)
+    np.fill_diagonal(corr, 1.0)
+    columns = list(columns)
+    return pd.DataFrame(corr, index=columns, columns=columns)
+
+
+def pair_correlations(df):
+    """Pearson correlation of each ``CORR_PAIRS`` column pair, in percent."""
+    corr = correlation_matrix(df, columns=("cost", "payload", "fuel", "duration"))
+    return [round(float(corr.at[a, b]) * 100, 1) for a, b in CORR_PAIRS]
+
+
+# ─── Bonus: crypto price simulation ───────────────────────────────────────────
+def generate_prices(time_steps, amplitude, frequency, drift, noise, base_price, seed=42):
+    """Price = Amplitude x sin(Frequency x Time) + Drift x Time + Noise, as a DataFrame.
+
+    Seeds NumPy's global generator, so later draws (the asset comparison) follow on
+    from the same stream as before.
+    """
+    np.random.seed(seed)
+    time_arr = np.arange(time_steps)
+    sine_component = amplitude * np.sin(frequency * time_arr)
+    drift_component = drift * time_arr
+    noise_component = np.random.normal(0, noise, time_steps)
+    price_arr = base_price + sine_component + drift_component + noise_component
+    return pd.DataFrame({
+        "Time":             time_arr,
+        "Price":            price_arr,
+        "Drift_Component":  drift_component,
+        "Noise_Component":  noise_component,
+    })
+
+
+def clean_prices(crypto_df):
+    clean = crypto_df.copy()
+    clean = clean[clean["Price"] > 0].reset_index(drop=True)
+    clean["Time"] = clean["Time"].astype(int)
+    clean["Price"] = clean["Price"].astype(float)
+    clean["Drift_Component"] = clean["Drift_Component"].astype(float)
+    clean["Noise_Component"] = clean["Noise_Component"].astype(float)
+    return clean
+
+
+def price_stats(prices):
+    """Mean, standard deviation, variance and mean period return (in percent) of a price series."""
+    returns = np.diff(prices) / prices[:-1]
+    return {
+        "mean": float(np.mean(prices)),
+        "std": float(np.std(prices)),
+        "var": float(np.var(prices)),
+        "mean_return": float(np.mean(returns)) * 100,
+    }
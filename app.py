@@ -1,9 +1,23 @@
+import os
+
 import streamlit as st
-import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from analytics import (
+    CORR_COLUMNS, TABLE_COLUMNS, clean_prices, correlation_matrix, generate_prices, mission_table_html, price_stats,
+    sort_rows,
+)
+from charts import DENSITY_BINS, DENSITY_POINTS, THEME, WEBGL_POINTS, density_grid, downsample_minmax
+from mission_store import MissionStore
+from ingest import LiveMissions
+from missions import source_version
+from result_cache import ResultCache
+from simulation import (
+    DRY_MASS, GRAVITY, PARAMS, Trajectory, monte_carlo, sensitivity, simulate_adaptive, simulate_batch, solve_minimum, sweep,
+)
+
 # ─── Page config ──────────────────────────────────────────────────────────────
 st.set_page_config(
     page_title="Aerospace Data Insights Platform",
@@ -674,21 +688,91 @@ hr {
 """, unsafe_allow_html=True)
 
 # ─── Dataset ──────────────────────────────────────────────────────────────────
-mock_data = [
-    {"id": 1,  "mission": "SpaceX Crew-1",          "type": "Crewed",   "cost": 62,  "payload": 5800,  "fuel": 450000,  "duration": 28,  "crew": 4, "success": "Yes", "target": "LEO",  "vehicle": "Falcon 9",  "year": 2020, "distance": 408},
-    {"id": 2,  "mission": "Blue Origin New Shepard", "type": "Uncrewed", "cost": 28,  "payload": 3600,  "fuel": 280000,  "duration": 10,  "crew": 0, "success": "Yes", "target": "LEO",  "vehicle": "New Shepard","year": 2021, "distance": 100},
-    {"id": 3,  "mission": "Ariane 5 ECA",            "type": "Uncrewed", "cost": 165, "payload": 10200, "fuel": 650000,  "duration": 45,  "crew": 0, "success": "Yes", "target": "GEO",  "vehicle": "Ariane 5",  "year": 2022, "distance": 36000},
-    {"id": 4,  "mission": "Delta IV Heavy",           "type": "Uncrewed", "cost": 350, "payload": 28800, "fuel": 950000,  "duration": 180, "crew": 0, "success": "Yes", "target": "Moon", "vehicle": "Delta IV",   "year": 2023, "distance": 384400},
-    {"id": 5,  "mission": "SpaceX Falcon Heavy",      "type": "Uncrewed", "cost": 90,  "payload": 63800, "fuel": 1200000, "duration": 365, "crew": 0, "success": "Yes", "target": "Mars", "vehicle": "Falcon 9",  "year": 2021, "distance": 54600000},
-    {"id": 6,  "mission": "Soyuz MS-19",              "type": "Crewed",   "cost": 45,  "payload": 7500,  "fuel": 380000,  "duration": 180, "crew": 3, "success": "Yes", "target": "LEO",  "vehicle": "Soyuz",     "year": 2022, "distance": 408},
-    {"id": 7,  "mission": "Atlas V 541",              "type": "Uncrewed", "cost": 185, "payload": 8900,  "fuel": 620000,  "duration": 60,  "crew": 0, "success": "No",  "target": "GEO",  "vehicle": "Atlas V",   "year": 2020, "distance": 35800},
-    {"id": 8,  "mission": "JAXA H-IIA",               "type": "Uncrewed", "cost": 75,  "payload": 4200,  "fuel": 400000,  "duration": 25,  "crew": 0, "success": "Yes", "target": "LEO",  "vehicle": "H-IIA",     "year": 2023, "distance": 450},
-    {"id": 9,  "mission": "SpaceX Crew-2",            "type": "Crewed",   "cost": 60,  "payload": 5900,  "fuel": 460000,  "duration": 28,  "crew": 4, "success": "Yes", "target": "LEO",  "vehicle": "Falcon 9",  "year": 2021, "distance": 410},
-    {"id": 10, "mission": "Vega C",                   "type": "Uncrewed", "cost": 32,  "payload": 2500,  "fuel": 240000,  "duration": 15,  "crew": 0, "success": "Yes", "target": "LEO",  "vehicle": "Vega",      "year": 2022, "distance": 500},
-    {"id": 11, "mission": "ULA Vulcan",               "type": "Uncrewed", "cost": 110, "payload": 9600,  "fuel": 700000,  "duration": 50,  "crew": 0, "success": "No",  "target": "Moon", "vehicle": "Vulcan",    "year": 2023, "distance": 380000},
-    {"id": 12, "mission": "ISRO LVM3",                "type": "Uncrewed", "cost": 40,  "payload": 6000,  "fuel": 420000,  "duration": 30,  "crew": 0, "success": "Yes", "target": "LEO",  "vehicle": "LVM3",      "year": 2021, "distance": 600},
-]
-df_full = pd.DataFrame(mock_data)
+@st.cache_resource(show_spinner="Loading missions...")
+def live_missions(path):
+    # One ingest per launch log, shared by every session; each refresh only parses rows appended since the last
+    return LiveMissions(path)
+
+def stage2_positions(snapshot, mission_type, vehicle, year_range):
+    # An empty selection falls back to every mission
+    positions = snapshot.index.positions(mission_type, vehicle, year_range)
+    return positions if len(positions) else np.arange(snapshot.index.n)
+
+@st.cache_resource(max_entries=32)
+def table_order(_snapshot, version, mission_type, vehicle, year_range, sort_column, descending):
+    # Display order of the whole filtered table; each page is a slice of it. ``version`` keys the cache,
+    # and every session reads the same read-only array rather than its own copy
+    positions = stage2_positions(_snapshot, mission_type, vehicle, year_range)
+    if sort_column is not None:
+        positions = sort_rows(_snapshot.frame, positions, sort_column, descending)
+    positions.flags.writeable = False
+    return positions
+
+@st.cache_resource(max_entries=8)
+def chart_rows(_snapshot, version, chart_success):
+    # Read-only positions of the Stage 03 selection; None when that is every mission (or nothing matches)
+    if chart_success is None:
+        return None
+    rows = _snapshot.index.positions(success=chart_success)
+    if len(rows) in (0, _snapshot.index.n):
+        return None
+    rows.flags.writeable = False
+    return rows
+
+@st.cache_resource
+def mission_store(path):
+    return MissionStore(path)
+
+@st.cache_resource(show_spinner=False, max_entries=128)
+def store_query(path, version, method, *args):
+    # Query results are cached per database version and shared read-only by every session,
+    # so paging back and forth stays off the disk
+    return getattr(mission_store(path), method)(*args)
+
+ALL_MISSIONS = ("All Types", "All Vehicles", None)
+DEFAULT_YEARS = (2020, 2023)  # Year Range bounds before any mission has arrived
+
+def selected_missions(version, rows, columns, filters=ALL_MISSIONS, success=None):
+    # Just ``columns`` of a selection, for cached charts and simulations to read on a miss: queried from SQLite,
+    # or taken from the shared frame by the selection's positions (``rows``; None means every mission)
+    if MISSION_DB:
+        return store_query(MISSION_DB, version, "select", *filters, success, columns)
+    frame = df_full[list(columns)]
+    return frame if rows is None else frame.take(rows)
+
+def selection_size(version, rows, success=None):
+    if MISSION_DB:
+        return store_query(MISSION_DB, version, "count", *ALL_MISSIONS, success)
+    return len(df_full) if rows is None else len(rows)
+
+def selection_density(version, rows, x, y, success, log_x=False, log_y=False):
+    # Mission counts on the DENSITY_BINS grid, for clouds too large to send as points
+    if MISSION_DB:
+        return store_query(MISSION_DB, version, "density", x, y, DENSITY_BINS, *ALL_MISSIONS, success, log_x, log_y)
+    df = selected_missions(version, rows, (x, y))
+    return density_grid(df[x].to_numpy(), df[y].to_numpy(), log_x=log_x, log_y=log_y)
+
+def outcome_means(version, rows, column, success):
+    # Mean of ``column`` over successful and failed missions; 0 for an empty group
+    if MISSION_DB:
+        return store_query(MISSION_DB, version, "outcome_means", column, *ALL_MISSIONS, success)
+    df = selected_missions(version, rows, (column, "success"))
+    values, ok = df[column].to_numpy(), df["success"].to_numpy()
+    return [values[ok].mean() if ok.any() else 0, values[~ok].mean() if not ok.all() else 0]
+
+MISSION_DATA = os.environ.get("MISSION_DATA")  # launch log file or drop directory; the built-in sample when unset
+MISSION_DB = os.environ.get("MISSION_DB")      # SQLite store from mission_store.py; queried instead of loaded
+if MISSION_DB:
+    snapshot, df_full, ingest_error = None, None, None
+    data_version = source_version(MISSION_DB)
+    has_missions = store_query(MISSION_DB, data_version, "kpis", *ALL_MISSIONS) is not None
+else:
+    live = live_missions(MISSION_DATA)
+    snapshot = live.refresh()
+    df_full, ingest_error = snapshot.frame, live.error
+    data_version = (MISSION_DATA, snapshot.version)
+    # A drop directory may start out empty; the stages show an empty state until files arrive
+    has_missions = len(df_full) > 0
 
 # ─── Session State ────────────────────────────────────────────────────────────
 if "logged_in" not in st.session_state:
@@ -698,30 +782,229 @@ if "user_email" not in st.session_state:
 
 # ─── Plotly theme helper ───────────────────────────────────────────────────────
 def styled_fig(fig, height=300):
-    fig.update_layout(
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        font=dict(family="Rajdhani, sans-serif", color="#8aa8d0", size=12),
-        margin=dict(l=10, r=10, t=20, b=10),
-        legend=dict(font=dict(color="#8aa8d0", size=11)),
-        height=height,
-    )
-    fig.update_xaxes(
-        gridcolor="rgba(0,80,200,0.1)",
-        linecolor="rgba(0,100,200,0.15)",
-        tickfont=dict(color="#6888aa", size=11),
-        title_font=dict(color="#8aa8d0", size=12),
-        zeroline=False,
-    )
-    fig.update_yaxes(
-        gridcolor="rgba(0,80,200,0.1)",
-        linecolor="rgba(0,100,200,0.15)",
-        tickfont=dict(color="#6888aa", size=11),
-        title_font=dict(color="#8aa8d0", size=12),
-        zeroline=False,
-    )
+    # The theme is the template registered in charts.py; draw with st.plotly_chart(..., theme=None)
+    fig.update_layout(template=THEME, height=height)
+    return fig
+
+# Point budget per chart trace; longer series are thinned with per-bucket min/max
+CHART_POINTS = 400
+
+def scatter_trace(n_points, **kwargs):
+    # SVG for small point clouds, WebGL once there are enough points to stall the browser
+    return (go.Scattergl if n_points > WEBGL_POINTS else go.Scatter)(**kwargs)
+
+def density_fig(grid, hovertemplate, log_x=False, log_y=False):
+    # Past DENSITY_POINTS a cloud is sent as mission counts per grid cell, so the figure has a fixed size
+    x_edges, y_edges, counts = grid
+    fig = go.Figure(go.Heatmap(
+        x=x_edges, y=y_edges, z=counts,
+        colorscale=[[0, "#0a1640"], [0.5, "#5060ff"], [1, "#00c8ff"]],
+        colorbar=dict(title="Missions", tickfont=dict(color="#6888aa", size=11), outlinewidth=0),
+        hoverongaps=False, hovertemplate=hovertemplate
+    ))
+    fig.update_xaxes(type="log" if log_x else None)
+    fig.update_yaxes(type="log" if log_y else None)
     return fig
 
+# ─── Stage 03 charts ──────────────────────────────────────────────────────────
+# Each chart's finished figure is cached per dataset version and chart filter and shared by every session,
+# so reruns from unrelated widgets rebuild nothing. st.plotly_chart serializes a copy and never modifies it.
+# Builders get the selection's read-only positions and read the columns they draw only on a cache miss;
+# with MISSION_DB, means, correlations and large clouds' density grids are aggregated by SQLite instead.
+CORR_LABELS = {"cost": "Cost", "payload": "Payload", "fuel": "Fuel", "duration": "Duration", "crew": "Crew",
+               "distance": "Distance", "year": "Year", "success": "Success"}
+
+@st.cache_resource(max_entries=8)
+def payload_fuel_fig(_rows, version, chart_success):
+    if selection_size(version, _rows, chart_success) > DENSITY_POINTS:
+        fig = density_fig(selection_density(version, _rows, "payload", "fuel", chart_success),
+                          "Payload: %{x:,.0f} kg<br>Fuel: %{y:,.0f} L<br>Missions: %{z:,}<extra></extra>")
+    else:
+        chart_df = selected_missions(version, _rows, ("mission", "payload", "fuel", "success"), success=chart_success)
+        fig = go.Figure()
+        fig.add_trace(scatter_trace(
+            len(chart_df),
+            x=chart_df["payload"], y=chart_df["fuel"],
+            mode="markers",
+            marker=dict(color=np.where(chart_df["success"].to_numpy(), "#00c8ff", "#ff4466"), size=11,
+                        line=dict(width=1.5, color="rgba(255,255,255,0.15)"), symbol="circle"),
+            text=chart_df["mission"],
+            hovertemplate="<b>%{text}</b><br>Payload: %{x:,} kg<br>Fuel: %{y:,} L<extra></extra>"
+        ))
+    fig.update_layout(xaxis_title="Payload (kg)", yaxis_title="Fuel (L)")
+    return styled_fig(fig)
+
+@st.cache_resource(max_entries=8)
+def cost_outcome_fig(_rows, version, chart_success):
+    s_avg, f_avg = outcome_means(version, _rows, "cost", chart_success)
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=["Successful", "Failed"], y=[s_avg, f_avg],
+        marker_color=["rgba(0,200,255,0.8)", "rgba(255,60,80,0.8)"],
+        marker_line_width=0,
+        hovertemplate="%{x}: $%{y:.1f}M<extra></extra>"
+    ))
+    fig.update_layout(yaxis_title="Avg. Cost ($M)", showlegend=False, bargap=0.5)
+    return styled_fig(fig)
+
+@st.cache_resource(max_entries=8)
+def duration_distance_fig(_rows, version, chart_success):
+    if selection_size(version, _rows, chart_success) > DENSITY_POINTS:
+        fig = density_fig(selection_density(version, _rows, "distance", "duration", chart_success, log_x=True),
+                          "Distance: %{x:,.0f} km<br>Duration: %{y:,.0f} days<br>Missions: %{z:,}<extra></extra>",
+                          log_x=True)
+        fig.update_layout(xaxis_title="Distance (km)", yaxis_title="Duration (days)")
+    else:
+        chart_df = selected_missions(version, _rows, ("mission", "distance", "duration"), success=chart_success)
+        by_distance = np.argsort(chart_df["distance"].to_numpy(), kind="stable")
+        fig = go.Figure()
+        fig.add_trace(scatter_trace(
+            len(chart_df),
+            x=chart_df["mission"].str[:14].to_numpy()[by_distance], y=chart_df["duration"].to_numpy()[by_distance],
+            mode="lines+markers",
+            line=dict(color="#5060ff", width=2.5),
+            fill="tozeroy", fillcolor="rgba(60,80,255,0.08)",
+            marker=dict(color="#00c8ff", size=7, line=dict(width=1, color="rgba(255,255,255,0.2)")),
+            hovertemplate="%{x}<br>Duration: %{y} days<extra></extra>"
+        ))
+        fig.update_layout(yaxis_title="Duration (days)")
+        fig.update_xaxes(tickangle=-30)
+    return styled_fig(fig)
+
+@st.cache_resource(max_entries=8)
+def crew_outcome_fig(_rows, version, chart_success):
+    sc_avg, fc_avg = outcome_means(version, _rows, "crew", chart_success)
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=["Successful", "Failed"], y=[round(sc_avg, 1), round(fc_avg, 1)],
+        marker_color=["rgba(0,200,255,0.8)", "rgba(255,60,80,0.8)"],
+        marker_line_width=0,
+        hovertemplate="%{x}: %{y:.1f} crew<extra></extra>"
+    ))
+    fig.update_layout(yaxis_title="Avg Crew Size", showlegend=False, bargap=0.5)
+    return styled_fig(fig)
+
+@st.cache_resource(max_entries=16)
+def correlation_fig(_rows, version, chart_success, method):
+    if MISSION_DB:
+        corr = store_query(MISSION_DB, version, "correlations", method, *ALL_MISSIONS, chart_success, CORR_COLUMNS)
+    else:
+        corr = correlation_matrix(selected_missions(version, _rows, CORR_COLUMNS), method)
+    corr_labels = [CORR_LABELS[name] for name in CORR_COLUMNS]
+    fig = go.Figure(go.Heatmap(
+        x=corr_labels, y=corr_labels, z=corr.to_numpy() * 100, zmin=-100, zmax=100,
+        colorscale=[[0, "rgba(255,60,80,0.9)"], [0.5, "#0a1640"], [1, "#00c8ff"]],
+        texttemplate="%{z:.0f}", textfont=dict(size=11),
+        colorbar=dict(tickfont=dict(color="#6888aa", size=11), outlinewidth=0, ticksuffix="%"),
+        hovertemplate="%{y} vs %{x}: %{z:.1f}%<extra></extra>"
+    ))
+    fig.update_yaxes(autorange="reversed")
+    return styled_fig(fig, height=420)
+
+# ─── Simulation helpers ───────────────────────────────────────────────────────
+SWEEP_PARAMS = {
+    "Payload Weight (kg)": ("payload", 1000, 50000),
+    "Thrust Force (N)":    ("thrust", 1000000, 15000000),
+    "Initial Fuel (L)":    ("fuel", 50000, 500000),
+    "Drag Factor":         ("drag", 0.00001, 0.001),
+}
+SWEEP_METRICS = {
+    "Max Altitude (m)":   "max_altitude",
+    "Max Velocity (m/s)": "max_velocity",
+    "Burnout Time (s)":   "burnout_time",
+}
+
+@st.cache_resource
+def sim_cache():
+    # One cache per server process, shared by every session; SIM_CACHE_DIR adds an on-disk store
+    return ResultCache(max_bytes=256 * 1024 * 1024, path=os.environ.get("SIM_CACHE_DIR"))
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def solve_target(param, quantity, level, base, lo, hi):
+    return solve_minimum(param, quantity, level, dict(base), lo, hi)
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def dispersion_run(nominal, spreads, n_runs, seed):
+    return monte_carlo(dict(nominal), dict(spreads), n_runs, seed=seed)
+
+SENSITIVITY_METRICS = {
+    "Max Altitude (m)":   "max_altitude",
+    "Max Velocity (m/s)": "max_velocity",
+    "Flight Time (s)":    "flight_time",
+}
+PARAM_LABELS = {"payload": "Payload", "thrust": "Thrust", "fuel": "Fuel", "drag": "Drag"}
+PARAM_UNITS = {"payload": "/kg", "thrust": "/N", "fuel": "/L", "drag": ""}
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def sensitivity_run(base, rel_step):
+    return sensitivity(dict(base), rel_step)
+
+@st.cache_resource(max_entries=16)
+def mission_apogees(_rows, version, filters, thrust_to_weight, drag):
+    # Apogee (km), max velocity and target reached for each selected mission, shared read-only by every session.
+    # The dataset has no engine data, so each vehicle gets the thrust that gives it this liftoff thrust-to-weight ratio
+    df = selected_missions(version, _rows, ("payload", "fuel", "distance"), filters)
+    payload, fuel = df["payload"].to_numpy(np.float64), df["fuel"].to_numpy(np.float64)
+    thrust = thrust_to_weight * (DRY_MASS + payload + fuel) * GRAVITY
+    sim = simulate_batch(payload, thrust, fuel, drag, history=False)
+    apogee_km = sim["max_altitude"] / 1000
+    result = (apogee_km, sim["max_velocity"], apogee_km >= df["distance"].to_numpy(np.float64))
+    for values in result:
+        values.flags.writeable = False
+    return result
+
+TARGET_COLORS = {"LEO": "#00c8ff", "GEO": "#8060ff", "Moon": "#ffaa40", "Mars": "#ff4466"}
+
+@st.cache_resource(max_entries=16)
+def apogee_overlay_fig(_rows, _apogee_km, _sim_velocity, version, filters, thrust_to_weight, drag):
+    # The simulated arrays follow from the missions and sliders that key the cache
+    dense = len(_apogee_km) > DENSITY_POINTS
+    df = selected_missions(version, _rows, ("distance",) if dense else ("mission", "target", "distance"), filters)
+    distance_km = df["distance"].to_numpy(np.float64)
+    if dense:
+        fig = density_fig(density_grid(distance_km, _apogee_km, log_x=True, log_y=True),
+                         "Target: %{x:,.0f} km<br>Apogee: %{y:,.1f} km<br>Missions: %{z:,}<extra></extra>",
+                         log_x=True, log_y=True)
+    else:
+        fig = go.Figure()
+        names = df["mission"].to_numpy()
+        for target, color in TARGET_COLORS.items():
+            sel = (df["target"] == target).to_numpy()
+            if not sel.any():
+                continue
+            fig.add_trace(scatter_trace(
+                len(df),
+                x=distance_km[sel], y=_apogee_km[sel], mode="markers", name=target, text=names[sel],
+                customdata=_sim_velocity[sel],
+                marker=dict(color=color, size=9, opacity=0.85, line=dict(width=0)),
+                hovertemplate="%{text}<br>Target: %{x:,.0f} km<br>Apogee: %{y:,.1f} km<br>Max velocity: %{customdata:,.0f} m/s<extra></extra>"
+            ))
+    if len(df):
+        lo = max(min(distance_km.min(), _apogee_km.min()), 1e-3)
+        hi = max(distance_km.max(), _apogee_km.max())
+        fig.add_trace(go.Scatter(
+            x=[lo, hi], y=[lo, hi], mode="lines", name="Apogee = Target",
+            line=dict(color="rgba(160,196,255,0.4)", width=1.5, dash="dash"), hoverinfo="skip"
+        ))
+    fig.update_layout(xaxis_title="Target Distance (km)", yaxis_title="Simulated Apogee (km)",
+                     xaxis_type="log", yaxis_type="log", showlegend=True)
+    return styled_fig(fig, height=380)
+
+def band_fig(time_arr, bands, color, fill, y_title):
+    # P5–P95 envelope with the median on top
+    p5, p50, p95 = bands
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=time_arr, y=p95, mode="lines", line=dict(width=0), name="P95", hoverinfo="skip"))
+    fig.add_trace(go.Scatter(x=time_arr, y=p5, mode="lines", line=dict(width=0), fill="tonexty", fillcolor=fill, name="P5–P95"))
+    fig.add_trace(go.Scatter(x=time_arr, y=p50, mode="lines", line=dict(color=color, width=2.5), name="Median"))
+    fig.update_layout(xaxis_title="Time (s)", yaxis_title=y_title, showlegend=False)
+    return styled_fig(fig)
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def sweep_grid(x_name, x_values, y_name, y_values, base):
+    # Arguments are plain tuples so identical sweeps hit the cache across reruns and sessions
+    return sweep(x_name, x_values, y_name, y_values, dict(base))
+
 # ─── LOGIN SCREEN ─────────────────────────────────────────────────────────────
 if not st.session_state.logged_in:
 
@@ -1137,26 +1420,41 @@ else:
         </div>
         """, unsafe_allow_html=True)
 
+        if ingest_error:
+            st.warning(f"Could not read new rows from {MISSION_DATA}: {ingest_error}. Showing the missions loaded so far.")
+        if not has_missions:
+            st.info("No missions yet. The dashboard updates as soon as launch records arrive.")
+
         fc1, fc2 = st.columns(2)
         with fc1:
             mission_type = st.selectbox("Mission Type", ["All Types", "Crewed", "Uncrewed"], key="s2_type")
         with fc2:
-            vehicle = st.selectbox("Launch Vehicle", ["All Vehicles", "Falcon 9", "Atlas V", "Ariane 5", "Soyuz"], key="s2_vehicle")
-        year_range = st.slider("Year Range", min_value=2020, max_value=2023, value=(2020, 2023), key="s2_year")
-
-        df = df_full.copy()
-        if mission_type != "All Types":
-            df = df[df["type"] == mission_type]
-        if vehicle != "All Vehicles":
-            df = df[df["vehicle"] == vehicle]
-        df = df[(df["year"] >= year_range[0]) & (df["year"] <= year_range[1])]
-        if len(df) == 0:
-            df = df_full.copy()
-
-        total = len(df)
-        success_rate = (df["success"] == "Yes").sum() / total * 100
-        avg_cost = df["cost"].mean()
-        avg_duration = df["duration"].mean()
+            if MISSION_DB:
+                vehicles, year_min, year_max = store_query(MISSION_DB, data_version, "options")
+            else:
+                vehicles = sorted(df_full["vehicle"].unique())
+                year_min, year_max = (int(df_full["year"].min()), int(df_full["year"].max())) if has_missions else (None, None)
+            if year_min is None:
+                year_min, year_max = DEFAULT_YEARS
+            vehicle = st.selectbox("Launch Vehicle", ["All Vehicles"] + vehicles, key="s2_vehicle")
+        year_range = st.slider("Year Range", min_value=year_min, max_value=max(year_max, year_min + 1),
+                               value=(year_min, max(year_max, year_min + 1)), key="s2_year")
+
+        filters = (mission_type, vehicle, year_range)
+        if MISSION_DB:
+            # Filters and aggregates run inside SQLite; an empty selection shows every mission
+            kpis = store_query(MISSION_DB, data_version, "kpis", *filters)
+            if kpis is None:
+                filters = ALL_MISSIONS
+                kpis = store_query(MISSION_DB, data_version, "kpis", *filters)
+        else:
+            # Metric cards come from the pre-aggregated cube; an empty selection shows every mission, like the table
+            kpis = snapshot.cube.kpis(*filters) or snapshot.cube.kpis()
+        kpis = kpis or {"missions": 0, "success_rate": 0.0, "avg_cost": 0.0, "avg_duration": 0.0}
+        total = kpis["missions"]
+        success_rate = kpis["success_rate"]
+        avg_cost = kpis["avg_cost"]
+        avg_duration = kpis["avg_duration"]
 
         m1, m2, m3, m4 = st.columns(4)
         m1.metric("Missions", total)
@@ -1219,45 +1517,30 @@ else:
         </style>
         """, unsafe_allow_html=True)
 
-        rows_html = ""
-        for _, row in df.iterrows():
-            s_color = "#00c8ff" if row["success"] == "Yes" else "#ff4466"
-            s_bg    = "rgba(0,200,255,0.08)" if row["success"] == "Yes" else "rgba(255,60,100,0.08)"
-            s_border = s_color + "40"
-            type_val    = str(row['type']).upper()
-            mission_val = str(row['mission'])
-            cost_val    = "$" + str(row['cost']) + "M"
-            payload_val = "{:,}".format(int(row['payload']))
-            fuel_val    = "{:,}".format(int(row['fuel']))
-            dur_val     = str(row['duration'])
-            succ_val    = str(row['success']).upper()
-            year_val    = str(row['year'])
-
-            rows_html += (
-                '<tr class="data-row">'
-                '<td style="font-weight:600;color:#c8d8f0;">' + mission_val + '</td>'
-                '<td><span style="background:rgba(0,100,200,0.15);border:1px solid rgba(0,120,255,0.2);border-radius:4px;padding:3px 10px;font-size:12px;color:#80b0ff;font-family:Share Tech Mono,monospace;letter-spacing:1px;">' + type_val + '</span></td>'
-                '<td style="color:#a0c8ff;font-family:Share Tech Mono,monospace;">' + cost_val + '</td>'
-                '<td style="color:#c8d8f0;font-family:Share Tech Mono,monospace;">' + payload_val + '</td>'
-                '<td style="color:#c8d8f0;font-family:Share Tech Mono,monospace;">' + fuel_val + '</td>'
-                '<td style="color:#c8d8f0;font-family:Share Tech Mono,monospace;">' + dur_val + '</td>'
-                '<td><span style="background:' + s_bg + ';border:1px solid ' + s_border + ';border-radius:4px;padding:3px 10px;font-size:12px;color:' + s_color + ';font-family:Share Tech Mono,monospace;font-weight:700;">' + succ_val + '</span></td>'
-                '<td style="color:rgba(160,196,255,0.6);font-family:Share Tech Mono,monospace;">' + year_val + '</td>'
-                '</tr>'
-            )
-
-        table_html = (
-            '<div class="custom-table-wrap">'
-            '<table class="custom-table">'
-            '<thead><tr>'
-            '<th>Mission Name</th><th>Type</th><th>Cost ($M)</th>'
-            '<th>Payload (kg)</th><th>Fuel (L)</th><th>Duration (days)</th>'
-            '<th>Success</th><th>Year</th>'
-            '</tr></thead>'
-            '<tbody>' + rows_html + '</tbody>'
-            '</table></div>'
-        )
-        st.markdown(table_html, unsafe_allow_html=True)
+        tc1, tc2, tc3, tc4 = st.columns([2, 1, 1, 1])
+        with tc1:
+            sort_label = st.selectbox("Sort By", ["Dataset Order"] + list(TABLE_COLUMNS), key="s2_sort")
+        with tc2:
+            sort_order = st.selectbox("Order", ["Ascending", "Descending"], key="s2_order")
+        with tc3:
+            page_size = st.selectbox("Rows per Page", [25, 50, 100], key="s2_page_size")
+        n_pages = max(1, -(-total // page_size))
+        if st.session_state.get("s2_page", 1) > n_pages:
+            st.session_state.s2_page = 1
+        with tc4:
+            page = st.number_input("Page", min_value=1, max_value=n_pages, value=1, step=1, key="s2_page")
+
+        # Sorting runs over the whole selection on the server; only the visible page becomes HTML
+        sort_column, descending = TABLE_COLUMNS.get(sort_label), sort_order == "Descending"
+        start = (page - 1) * page_size
+        if MISSION_DB:
+            page_df = store_query(MISSION_DB, data_version, "page", *filters, sort_column, descending, page_size, start)
+        else:
+            order = table_order(snapshot, data_version, *filters, sort_column, descending)
+            page_df = df_full.take(order[start:start + page_size])
+        st.markdown(mission_table_html(page_df), unsafe_allow_html=True)
+        if total:
+            st.caption(f"Rows {start + 1:,}–{min(start + page_size, total):,} of {total:,} · page {page:,} of {n_pages:,}")
         st.markdown('<div style="height:32px;"></div>', unsafe_allow_html=True)
 
     # ─── TAB 3: VISUALIZATIONS ───────────────────────────────────────────────
@@ -1278,142 +1561,76 @@ else:
         chart_filter = st.selectbox("Display Missions", ["All Missions", "Successful Only", "Failed Only"], key="chart_filter")
         st.markdown('</div>', unsafe_allow_html=True)
 
-        chart_df = df_full.copy()
-        if chart_filter == "Successful Only":
-            chart_df = chart_df[chart_df["success"] == "Yes"]
-        elif chart_filter == "Failed Only":
-            chart_df = chart_df[chart_df["success"] == "No"]
-        if len(chart_df) == 0:
-            chart_df = df_full.copy()
+        chart_success = {"Successful Only": True, "Failed Only": False}.get(chart_filter)
+        if not has_missions:
+            st.info("The charts appear once missions have been loaded.")
+        else:
+            if MISSION_DB:
+                rows = None
+                # An empty selection shows every mission
+                if chart_success is not None and not selection_size(data_version, None, chart_success):
+                    chart_success = None
+            else:
+                # Positions only; the charts read the missions themselves, and only when they are not cached
+                rows = chart_rows(snapshot, data_version, chart_success)
+                if rows is None:
+                    chart_success = None
 
-        success_df = chart_df[chart_df["success"] == "Yes"]
-        fail_df = chart_df[chart_df["success"] == "No"]
+            cc1, cc2 = st.columns(2)
 
-        cc1, cc2 = st.columns(2)
+            with cc1:
+                st.markdown('<div style="margin:0 16px 0 32px;">', unsafe_allow_html=True)
+                st.markdown("""
+                <div class="chart-label">Chart 01 · Payload vs Fuel Consumption</div>
+                <div class="chart-hint">Heavier payload = More fuel required</div>
+                """, unsafe_allow_html=True)
+                fig1 = payload_fuel_fig(rows, data_version, chart_success)
+                st.plotly_chart(fig1, use_container_width=True, config={"displayModeBar": False}, theme=None)
+                st.markdown('</div>', unsafe_allow_html=True)
 
-        with cc1:
-            st.markdown('<div style="margin:0 16px 0 32px;">', unsafe_allow_html=True)
-            st.markdown("""
-            <div class="chart-label">Chart 01 · Payload vs Fuel Consumption</div>
-            <div class="chart-hint">Heavier payload = More fuel required</div>
-            """, unsafe_allow_html=True)
-            colors = ["#00c8ff" if s == "Yes" else "#ff4466" for s in chart_df["success"]]
-            fig1 = go.Figure()
-            fig1.add_trace(go.Scatter(
-                x=chart_df["payload"], y=chart_df["fuel"],
-                mode="markers",
-                marker=dict(color=colors, size=11, line=dict(width=1.5, color="rgba(255,255,255,0.15)"), symbol="circle"),
-                text=chart_df["mission"],
-                hovertemplate="<b>%{text}</b><br>Payload: %{x:,} kg<br>Fuel: %{y:,} L<extra></extra>"
-            ))
-            fig1.update_layout(xaxis_title="Payload (kg)", yaxis_title="Fuel (L)")
-            fig1 = styled_fig(fig1)
-            st.plotly_chart(fig1, use_container_width=True, config={"displayModeBar": False})
-            st.markdown('</div>', unsafe_allow_html=True)
+            with cc2:
+                st.markdown('<div style="margin:0 32px 0 16px;">', unsafe_allow_html=True)
+                st.markdown("""
+                <div class="chart-label">Chart 02 · Mission Cost: Success vs Failure</div>
+                <div class="chart-hint">Cost does not guarantee mission success</div>
+                """, unsafe_allow_html=True)
+                fig2 = cost_outcome_fig(rows, data_version, chart_success)
+                st.plotly_chart(fig2, use_container_width=True, config={"displayModeBar": False}, theme=None)
+                st.markdown('</div>', unsafe_allow_html=True)
 
-        with cc2:
-            st.markdown('<div style="margin:0 32px 0 16px;">', unsafe_allow_html=True)
-            st.markdown("""
-            <div class="chart-label">Chart 02 · Mission Cost: Success vs Failure</div>
-            <div class="chart-hint">Cost does not guarantee mission success</div>
-            """, unsafe_allow_html=True)
-            s_avg = success_df["cost"].mean() if len(success_df) > 0 else 0
-            f_avg = fail_df["cost"].mean() if len(fail_df) > 0 else 0
-            fig2 = go.Figure()
-            fig2.add_trace(go.Bar(
-                x=["Successful", "Failed"], y=[s_avg, f_avg],
-                marker_color=["rgba(0,200,255,0.8)", "rgba(255,60,80,0.8)"],
-                marker_line_width=0,
-                hovertemplate="%{x}: $%{y:.1f}M<extra></extra>"
-            ))
-            fig2.update_layout(yaxis_title="Avg. Cost ($M)", showlegend=False, bargap=0.5)
-            fig2 = styled_fig(fig2)
-            st.plotly_chart(fig2, use_container_width=True, config={"displayModeBar": False})
-            st.markdown('</div>', unsafe_allow_html=True)
+            cc3, cc4 = st.columns(2)
 
-        cc3, cc4 = st.columns(2)
+            with cc3:
+                st.markdown('<div style="margin:0 16px 0 32px;">', unsafe_allow_html=True)
+                st.markdown("""
+                <div class="chart-label">Chart 03 · Mission Duration vs Distance</div>
+                <div class="chart-hint">Farther missions take significantly longer</div>
+                """, unsafe_allow_html=True)
+                fig3 = duration_distance_fig(rows, data_version, chart_success)
+                st.plotly_chart(fig3, use_container_width=True, config={"displayModeBar": False}, theme=None)
+                st.markdown('</div>', unsafe_allow_html=True)
 
-        with cc3:
-            st.markdown('<div style="margin:0 16px 0 32px;">', unsafe_allow_html=True)
-            st.markdown("""
-            <div class="chart-label">Chart 03 · Mission Duration vs Distance</div>
-            <div class="chart-hint">Farther missions take significantly longer</div>
-            """, unsafe_allow_html=True)
-            sorted_df = chart_df.sort_values("distance")
-            fig3 = go.Figure()
-            fig3.add_trace(go.Scatter(
-                x=sorted_df["mission"].str[:14], y=sorted_df["duration"],
-                mode="lines+markers",
-                line=dict(color="#5060ff", width=2.5),
-                fill="tozeroy", fillcolor="rgba(60,80,255,0.08)",
-                marker=dict(color="#00c8ff", size=7, line=dict(width=1, color="rgba(255,255,255,0.2)")),
-                hovertemplate="%{x}<br>Duration: %{y} days<extra></extra>"
-            ))
-            fig3.update_layout(yaxis_title="Duration (days)")
-            fig3.update_xaxes(tickangle=-30)
-            fig3 = styled_fig(fig3)
-            st.plotly_chart(fig3, use_container_width=True, config={"displayModeBar": False})
-            st.markdown('</div>', unsafe_allow_html=True)
+            with cc4:
+                st.markdown('<div style="margin:0 32px 0 16px;">', unsafe_allow_html=True)
+                st.markdown("""
+                <div class="chart-label">Chart 04 · Crew Size vs Mission Success</div>
+                <div class="chart-hint">Crewed missions show higher success correlation</div>
+                """, unsafe_allow_html=True)
+                fig4 = crew_outcome_fig(rows, data_version, chart_success)
+                st.plotly_chart(fig4, use_container_width=True, config={"displayModeBar": False}, theme=None)
+                st.markdown('</div>', unsafe_allow_html=True)
 
-        with cc4:
-            st.markdown('<div style="margin:0 32px 0 16px;">', unsafe_allow_html=True)
+            st.markdown('<div style="margin:0 32px;">', unsafe_allow_html=True)
             st.markdown("""
-            <div class="chart-label">Chart 04 · Crew Size vs Mission Success</div>
-            <div class="chart-hint">Crewed missions show higher success correlation</div>
+            <div class="chart-label">Chart 05 · Correlation Analysis — All Variables</div>
+            <div class="chart-hint">Positive values = strong positive relationship; negative = inverse relationship</div>
             """, unsafe_allow_html=True)
-            sc_avg = success_df["crew"].mean() if len(success_df) > 0 else 0
-            fc_avg = fail_df["crew"].mean() if len(fail_df) > 0 else 0
-            fig4 = go.Figure()
-            fig4.add_trace(go.Bar(
-                x=["Successful", "Failed"], y=[round(sc_avg, 1), round(fc_avg, 1)],
-                marker_color=["rgba(0,200,255,0.8)", "rgba(255,60,80,0.8)"],
-                marker_line_width=0,
-                hovertemplate="%{x}: %{y:.1f} crew<extra></extra>"
-            ))
-            fig4.update_layout(yaxis_title="Avg Crew Size", showlegend=False, bargap=0.5)
-            fig4 = styled_fig(fig4)
-            st.plotly_chart(fig4, use_container_width=True, config={"displayModeBar": False})
-            st.markdown('</div>', unsafe_allow_html=True)
-
-        st.markdown('<div style="margin:0 32px;">', unsafe_allow_html=True)
-        st.markdown("""
-        <div class="chart-label">Chart 05 · Correlation Analysis — All Variables</div>
-        <div class="chart-hint">Positive values = strong positive relationship; negative = inverse relationship</div>
-        """, unsafe_allow_html=True)
-
-        def safe_corr(a, b):
-            if len(a) < 2:
-                return 0.0
-            r = np.corrcoef(a.values, b.values)
-            return float(r[0, 1]) if not np.isnan(r[0, 1]) else 0.0
-
-        labels = ["Cost vs\nPayload", "Cost vs\nFuel", "Cost vs\nDuration", "Payload vs\nFuel", "Payload vs\nDuration", "Fuel vs\nDuration"]
-        pairs = [
-            (chart_df["cost"], chart_df["payload"]),
-            (chart_df["cost"], chart_df["fuel"]),
-            (chart_df["cost"], chart_df["duration"]),
-            (chart_df["payload"], chart_df["fuel"]),
-            (chart_df["payload"], chart_df["duration"]),
-            (chart_df["fuel"], chart_df["duration"]),
-        ]
-        corr_vals = [round(safe_corr(a, b) * 100, 1) for a, b in pairs]
-        bar_colors = [
-            "rgba(0,200,255,0.85)" if v > 60
-            else "rgba(80,100,255,0.8)" if v >= 0
-            else "rgba(255,60,80,0.8)"
-            for v in corr_vals
-        ]
 
-        fig5 = go.Figure()
-        fig5.add_trace(go.Bar(
-            x=labels, y=corr_vals,
-            marker_color=bar_colors, marker_line_width=0,
-            hovertemplate="%{x}: %{y:.1f}%<extra></extra>"
-        ))
-        fig5.update_layout(yaxis_title="Correlation Coefficient (%)", yaxis=dict(range=[-100, 100]), showlegend=False, height=300)
-        fig5 = styled_fig(fig5, height=300)
-        st.plotly_chart(fig5, use_container_width=True, config={"displayModeBar": False})
-        st.markdown('</div>', unsafe_allow_html=True)
+            corr_method = st.selectbox("Correlation Method", ["Pearson", "Spearman (rank)"], key="corr_method")
+            fig5 = correlation_fig(rows, data_version, chart_success,
+                                   "spearman" if corr_method.startswith("Spearman") else "pearson")
+            st.plotly_chart(fig5, use_container_width=True, config={"displayModeBar": False}, theme=None)
+            st.markdown('</div>', unsafe_allow_html=True)
 
     # ─── TAB 4: SIMULATION ───────────────────────────────────────────────────
     with tab4:
@@ -1447,74 +1664,52 @@ else:
 
         if run_sim or "sim_results" in st.session_state:
             if run_sim:
-                dt = 0.1
-                gravity = 9.81
-                mass = 5000.0 + payload_val
-                fuel_mass = float(fuel_val)
-                velocity = 0.0
-                altitude = 0.0
-                time_data, altitude_data, velocity_data, accel_data = [], [], [], []
-
-                for step in range(int(300 / dt)):
-                    t = step * dt
-                    drag_force = drag_val * velocity * abs(velocity)
-                    thrust_force = thrust_val if fuel_mass > 0 else 0
-                    gravity_force = mass * gravity
-                    net_force = thrust_force - gravity_force - drag_force
-                    acceleration = net_force / mass
-                    velocity += acceleration * dt
-                    altitude += velocity * dt
-                    if fuel_mass > 0:
-                        burn = thrust_val * dt / 1000
-                        fuel_mass -= burn
-                        mass -= burn
-                    if altitude < 0:
-                        altitude = 0.0
-                        velocity = 0.0
-                        break
-                    time_data.append(round(t, 1))
-                    altitude_data.append(round(altitude, 2))
-                    velocity_data.append(round(velocity, 2))
-                    accel_data.append(round(acceleration, 4))
-
-                st.session_state.sim_results = {
-                    "time": time_data, "altitude": altitude_data,
-                    "velocity": velocity_data, "accel": accel_data,
-                }
+                sim = sim_cache().get_or_compute(
+                    simulate_adaptive, payload=payload_val, thrust=thrust_val, fuel=fuel_val, drag=drag_val, sample_dt=0.1,
+                )
+                st.session_state.sim_results = Trajectory.from_result(sim)
 
             res = st.session_state.sim_results
-            time_arr = res["time"]; alt_arr = res["altitude"]
-            vel_arr = res["velocity"]; acc_arr = res["accel"]
+            time_arr = res.time; alt_arr = res.altitude
+            vel_arr = res.velocity; acc_arr = res.accel
 
             sm1, sm2, sm3, sm4 = st.columns(4)
-            sm1.metric("Max Altitude", f"{max(alt_arr):,.0f} m")
-            sm2.metric("Max Velocity", f"{max(vel_arr):,.0f} m/s")
-            sm3.metric("Flight Time", f"{len(time_arr) * 0.1:.1f} s")
-            sm4.metric("Peak Acceleration", f"{max(acc_arr):.1f} m/s²")
+            sm1.metric("Max Altitude", f"{res.max_altitude:,.0f} m")
+            sm2.metric("Max Velocity", f"{res.max_velocity:,.0f} m/s")
+            sm3.metric("Flight Time", f"{res.flight_time:.1f} s")
+            sm4.metric("Peak Acceleration", f"{res.peak_accel:.1f} m/s²")
+
+            event_labels = [("burnout", "Burnout"), ("max_q", "Max-Q"), ("apogee", "Apogee"), ("impact", "Impact")]
+            event_text = " · ".join(
+                f"{label} T+{res.events[name][0]:.2f} s @ {res.events[name][1]:,.0f} m"
+                for name, label in event_labels if name in res.events
+            )
+            st.caption(event_text or "Thrust-to-weight below 1 — the rocket never leaves the pad")
 
-            step_s = max(1, len(time_arr) // 120)
-            s_time = time_arr[::step_s]; s_alt = alt_arr[::step_s]
-            s_vel = vel_arr[::step_s]; s_acc = acc_arr[::step_s]
+            # Each chart is thinned on its own series so its peaks match the metric cards
+            t_alt, s_alt = downsample_minmax(time_arr, alt_arr, CHART_POINTS)
+            t_vel, s_vel = downsample_minmax(time_arr, vel_arr, CHART_POINTS)
+            t_acc, s_acc = downsample_minmax(time_arr, acc_arr, CHART_POINTS)
 
             sc1, sc2 = st.columns(2)
             with sc1:
                 st.markdown('<div style="margin:0 16px 0 32px;">', unsafe_allow_html=True)
                 st.markdown('<div class="chart-label">Altitude vs Time</div>', unsafe_allow_html=True)
                 fa = go.Figure()
-                fa.add_trace(go.Scatter(x=s_time, y=s_alt, mode="lines", line=dict(color="#00c8ff", width=2.5), fill="tozeroy", fillcolor="rgba(0,180,255,0.07)"))
+                fa.add_trace(go.Scatter(x=t_alt, y=s_alt, mode="lines", line=dict(color="#00c8ff", width=2.5), fill="tozeroy", fillcolor="rgba(0,180,255,0.07)"))
                 fa.update_layout(xaxis_title="Time (s)", yaxis_title="Altitude (m)")
                 fa = styled_fig(fa)
-                st.plotly_chart(fa, use_container_width=True, config={"displayModeBar": False})
+                st.plotly_chart(fa, use_container_width=True, config={"displayModeBar": False}, theme=None)
                 st.markdown('</div>', unsafe_allow_html=True)
 
             with sc2:
                 st.markdown('<div style="margin:0 32px 0 16px;">', unsafe_allow_html=True)
                 st.markdown('<div class="chart-label">Velocity vs Time</div>', unsafe_allow_html=True)
                 fv = go.Figure()
-                fv.add_trace(go.Scatter(x=s_time, y=s_vel, mode="lines", line=dict(color="#8060ff", width=2.5), fill="tozeroy", fillcolor="rgba(100,60,255,0.07)"))
+                fv.add_trace(go.Scatter(x=t_vel, y=s_vel, mode="lines", line=dict(color="#8060ff", width=2.5), fill="tozeroy", fillcolor="rgba(100,60,255,0.07)"))
                 fv.update_layout(xaxis_title="Time (s)", yaxis_title="Velocity (m/s)")
                 fv = styled_fig(fv)
-                st.plotly_chart(fv, use_container_width=True, config={"displayModeBar": False})
+                st.plotly_chart(fv, use_container_width=True, config={"displayModeBar": False}, theme=None)
                 st.markdown('</div>', unsafe_allow_html=True)
 
             sc3, sc4 = st.columns(2)
@@ -1522,10 +1717,10 @@ else:
                 st.markdown('<div style="margin:0 16px 0 32px;">', unsafe_allow_html=True)
                 st.markdown('<div class="chart-label">Acceleration vs Time</div>', unsafe_allow_html=True)
                 fa2 = go.Figure()
-                fa2.add_trace(go.Scatter(x=s_time, y=s_acc, mode="lines", line=dict(color="#00ff9d", width=2.5), fill="tozeroy", fillcolor="rgba(0,200,120,0.07)"))
+                fa2.add_trace(go.Scatter(x=t_acc, y=s_acc, mode="lines", line=dict(color="#00ff9d", width=2.5), fill="tozeroy", fillcolor="rgba(0,200,120,0.07)"))
                 fa2.update_layout(xaxis_title="Time (s)", yaxis_title="Acceleration (m/s²)")
                 fa2 = styled_fig(fa2)
-                st.plotly_chart(fa2, use_container_width=True, config={"displayModeBar": False})
+                st.plotly_chart(fa2, use_container_width=True, config={"displayModeBar": False}, theme=None)
                 st.markdown('</div>', unsafe_allow_html=True)
 
             with sc4:
@@ -1535,7 +1730,7 @@ else:
                     <div style="font-size:13px; color:rgba(160,200,255,0.7); line-height:1.9;">
                         &#8250; Thrust force peaks at ignition<br>
                         &#8250; As fuel burns, mass decreases &#8594; acceleration rises<br>
-                        &#8250; Drag force = drag_factor &#215; velocity&#178;<br>
+                        &#8250; Drag force = drag_factor &#215; &#961;/&#961;&#8320; &#215; velocity&#178; (standard atmosphere)<br>
                         &#8250; Peak velocity occurs at max thrust-to-weight<br>
                         &#8250; Altitude continues rising even after engine cutoff<br>
                         &#8250; Newton's 2nd law governs all motion: F = ma
@@ -1543,6 +1738,219 @@ else:
                 </div>
                 """, unsafe_allow_html=True)
 
+        # ── Parameter sweep ───────────────────────────────────────────────────
+        st.markdown('<div class="card-title" style="margin-top:24px;">&#128506; Parameter Sweep</div>', unsafe_allow_html=True)
+        st.caption("Evaluate every combination of two parameters at once; the other two stay at the slider values above")
+
+        sw1, sw2, sw3 = st.columns(3)
+        with sw1:
+            sweep_x = st.selectbox("X Axis", list(SWEEP_PARAMS), index=0, key="sweep_x")
+        with sw2:
+            sweep_y = st.selectbox("Y Axis", list(SWEEP_PARAMS), index=1, key="sweep_y")
+        with sw3:
+            sweep_metric = st.selectbox("Metric", list(SWEEP_METRICS), key="sweep_metric")
+        sweep_res = st.slider("Grid Resolution", min_value=10, max_value=100, value=40, step=5, key="sweep_res")
+
+        run_sweep = st.button("RUN SWEEP", key="run_sweep_btn")
+        if run_sweep:
+            if sweep_x == sweep_y:
+                st.warning("Choose two different parameters for the sweep axes")
+            else:
+                x_name, x_lo, x_hi = SWEEP_PARAMS[sweep_x]
+                y_name, y_lo, y_hi = SWEEP_PARAMS[sweep_y]
+                base = {"payload": payload_val, "thrust": thrust_val, "fuel": fuel_val, "drag": drag_val}
+                st.session_state.sweep_args = (
+                    x_name, tuple(np.linspace(x_lo, x_hi, sweep_res).tolist()),
+                    y_name, tuple(np.linspace(y_lo, y_hi, sweep_res).tolist()),
+                    tuple(sorted(base.items())),
+                )
+                st.session_state.sweep_labels = (sweep_x, sweep_y)
+
+        if "sweep_args" in st.session_state:
+            x_name, x_values, y_name, y_values, base = st.session_state.sweep_args
+            x_label, y_label = st.session_state.sweep_labels
+            with st.spinner("Running sweep..."):
+                grid = sweep_grid(x_name, x_values, y_name, y_values, base)
+
+            st.markdown('<div style="margin:0 32px;">', unsafe_allow_html=True)
+            st.markdown(f'<div class="chart-label">{sweep_metric} · {x_label} vs {y_label}</div>', unsafe_allow_html=True)
+            fh = go.Figure(go.Heatmap(
+                x=x_values, y=y_values, z=grid[SWEEP_METRICS[sweep_metric]],
+                colorscale=[[0, "#0a1640"], [0.5, "#5060ff"], [1, "#00c8ff"]],
+                colorbar=dict(tickfont=dict(color="#6888aa", size=11), outlinewidth=0),
+                hovertemplate="X: %{x:,.5g}<br>Y: %{y:,.5g}<br>Value: %{z:,.1f}<extra></extra>"
+            ))
+            fh.update_layout(xaxis_title=x_label, yaxis_title=y_label)
+            fh = styled_fig(fh, height=420)
+            st.plotly_chart(fh, use_container_width=True, config={"displayModeBar": False}, theme=None)
+            st.markdown('</div>', unsafe_allow_html=True)
+
+        # ── Inverse solver ────────────────────────────────────────────────────
+        st.markdown('<div class="card-title" style="margin-top:24px;">&#127919; Target Solver</div>', unsafe_allow_html=True)
+        st.caption("Find the smallest fuel load or thrust that reaches a target, holding the other sliders fixed")
+
+        ts1, ts2, ts3 = st.columns(3)
+        with ts1:
+            solve_for = st.selectbox("Solve For", ["Initial Fuel (L)", "Thrust Force (N)"], key="solve_for")
+        with ts2:
+            solve_quantity = st.selectbox("Target", ["Altitude (m)", "Velocity (m/s)"], key="solve_quantity")
+        with ts3:
+            solve_level = st.number_input("Target Value", min_value=1.0, value=100000.0, step=1000.0, key="solve_level")
+
+        if st.button("SOLVE", key="solve_btn"):
+            param, lo, hi = SWEEP_PARAMS[solve_for]
+            quantity = "altitude" if solve_quantity.startswith("Altitude") else "velocity"
+            base = {"payload": payload_val, "thrust": thrust_val, "fuel": fuel_val, "drag": drag_val}
+            base.pop(param)
+            st.session_state.solve_args = (param, quantity, float(solve_level), tuple(sorted(base.items())), lo, hi)
+            st.session_state.solve_label = solve_for
+
+        if "solve_args" in st.session_state:
+            param, quantity, level, base, lo, hi = st.session_state.solve_args
+            name, unit = st.session_state.solve_label.rstrip(")").split(" (")
+            with st.spinner("Solving..."):
+                solution = solve_target(param, quantity, level, base, lo, hi)
+            if solution["value"] is None:
+                st.warning(f"No {name.lower()} between {lo:,} and {hi:,} {unit} reaches {level:,.0f} — "
+                           f"checked with {solution['evaluations']} simulations")
+            else:
+                sv1, sv2 = st.columns(2)
+                sv1.metric(f"Minimum {name}", f"{solution['value']:,.0f} {unit}")
+                sv2.metric("Simulations Used", solution["evaluations"])
+
+        # ── Sensitivity ───────────────────────────────────────────────────────
+        st.markdown('<div class="card-title" style="margin-top:24px;">&#127786; Sensitivity</div>', unsafe_allow_html=True)
+        st.caption("How far each parameter moves the result around the slider values, from nine perturbed launches flown as one fixed-step batch, so its nominal can differ slightly from the metrics above")
+
+        se1, se2 = st.columns(2)
+        with se1:
+            sens_metric = st.selectbox("Metric", list(SENSITIVITY_METRICS), key="sens_metric")
+        with se2:
+            sens_step = st.slider("Perturbation (%)", min_value=1, max_value=25, value=5, step=1, key="sens_step")
+
+        base = {"payload": payload_val, "thrust": thrust_val, "fuel": fuel_val, "drag": drag_val}
+        sens = sensitivity_run(tuple(sorted(base.items())), sens_step / 100)[SENSITIVITY_METRICS[sens_metric]]
+        metric_unit = sens_metric.rstrip(")").split(" (")[1]
+
+        sd_cols = st.columns(len(PARAMS))
+        for col, name, derivative in zip(sd_cols, PARAMS, sens["derivative"]):
+            col.metric(f"∂ / ∂ {PARAM_LABELS[name]}", f"{derivative:,.4g} {metric_unit}{PARAM_UNITS[name]}")
+
+        # Widest swing on top
+        order = np.argsort(np.abs(sens["high"] - sens["low"]))
+        labels = [PARAM_LABELS[PARAMS[i]] for i in order]
+        low_delta = sens["low"][order] - sens["nominal"]
+        high_delta = sens["high"][order] - sens["nominal"]
+
+        st.markdown('<div style="margin:0 32px;">', unsafe_allow_html=True)
+        st.markdown(f'<div class="chart-label">{sens_metric} · ±{sens_step}% Tornado</div>', unsafe_allow_html=True)
+        ft = go.Figure()
+        ft.add_trace(go.Bar(
+            y=labels, x=low_delta, orientation="h", name=f"−{sens_step}%",
+            marker_color="rgba(255,68,102,0.75)", marker_line_width=0,
+            hovertemplate=f"%{{y}} −{sens_step}%: %{{x:+,.1f}} {metric_unit}<extra></extra>"
+        ))
+        ft.add_trace(go.Bar(
+            y=labels, x=high_delta, orientation="h", name=f"+{sens_step}%",
+            marker_color="rgba(0,200,255,0.75)", marker_line_width=0,
+            hovertemplate=f"%{{y}} +{sens_step}%: %{{x:+,.1f}} {metric_unit}<extra></extra>"
+        ))
+        ft.update_layout(barmode="overlay", xaxis_title=f"Change from batch nominal {sens['nominal']:,.1f} {metric_unit}", showlegend=True)
+        ft = styled_fig(ft)
+        st.plotly_chart(ft, use_container_width=True, config={"displayModeBar": False}, theme=None)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+        # ── Monte Carlo dispersion ────────────────────────────────────────────
+        st.markdown('<div class="card-title" style="margin-top:24px;">&#127922; Dispersion Analysis</div>', unsafe_allow_html=True)
+        st.caption("Perturb each parameter around the slider values and fly thousands of launches in parallel")
+
+        disp_cols = st.columns(4)
+        disp_spreads = {}
+        for col, (label, name, default_pct) in zip(disp_cols, [
+            ("Payload", "payload", 5.0), ("Thrust", "thrust", 3.0), ("Fuel", "fuel", 2.0), ("Drag", "drag", 15.0),
+        ]):
+            with col:
+                dist = st.selectbox(f"{label} Distribution", ["Normal", "Uniform"], key=f"disp_{name}_dist")
+                pct = st.number_input(f"{label} Spread (%)", min_value=0.0, max_value=50.0, value=default_pct, step=0.5, key=f"disp_{name}_pct")
+            disp_spreads[name] = (dist.lower(), pct / 100)
+        dr1, dr2 = st.columns([3, 1])
+        with dr1:
+            disp_runs = st.slider("Runs", min_value=1000, max_value=50000, value=10000, step=1000, key="disp_runs")
+        with dr2:
+            disp_seed = st.number_input("Seed", min_value=0, value=42, step=1, key="disp_seed")
+
+        if st.button("RUN DISPERSION", key="run_disp_btn"):
+            nominal = {"payload": payload_val, "thrust": thrust_val, "fuel": fuel_val, "drag": drag_val}
+            st.session_state.disp_args = (
+                tuple(sorted(nominal.items())), tuple(sorted(disp_spreads.items())), disp_runs, int(disp_seed),
+            )
+
+        if "disp_args" in st.session_state:
+            with st.spinner("Flying dispersed launches..."):
+                disp = dispersion_run(*st.session_state.disp_args)
+            apogee = disp["apogee"]
+
+            dm1, dm2, dm3, dm4 = st.columns(4)
+            dm1.metric("Runs", f"{apogee.size:,}")
+            dm2.metric("Apogee P5", f"{np.percentile(apogee, 5):,.0f} m")
+            dm3.metric("Apogee P50", f"{np.percentile(apogee, 50):,.0f} m")
+            dm4.metric("Apogee P95", f"{np.percentile(apogee, 95):,.0f} m")
+
+            dc1, dc2 = st.columns(2)
+            with dc1:
+                st.markdown('<div style="margin:0 16px 0 32px;">', unsafe_allow_html=True)
+                st.markdown('<div class="chart-label">Altitude Dispersion · P5 / P50 / P95</div>', unsafe_allow_html=True)
+                fd1 = band_fig(disp["time"], disp["altitude_bands"], "#00c8ff", "rgba(0,180,255,0.15)", "Altitude (m)")
+                st.plotly_chart(fd1, use_container_width=True, config={"displayModeBar": False}, theme=None)
+                st.markdown('</div>', unsafe_allow_html=True)
+            with dc2:
+                st.markdown('<div style="margin:0 32px 0 16px;">', unsafe_allow_html=True)
+                st.markdown('<div class="chart-label">Velocity Dispersion · P5 / P50 / P95</div>', unsafe_allow_html=True)
+                fd2 = band_fig(disp["time"], disp["velocity_bands"], "#8060ff", "rgba(100,60,255,0.15)", "Velocity (m/s)")
+                st.plotly_chart(fd2, use_container_width=True, config={"displayModeBar": False}, theme=None)
+                st.markdown('</div>', unsafe_allow_html=True)
+
+            st.markdown('<div style="margin:0 32px;">', unsafe_allow_html=True)
+            st.markdown('<div class="chart-label">Apogee Distribution</div>', unsafe_allow_html=True)
+            fd3 = go.Figure(go.Histogram(
+                x=apogee, nbinsx=60,
+                marker_color="rgba(0,200,255,0.7)", marker_line_width=0,
+                hovertemplate="Apogee: %{x:,.0f} m<br>Runs: %{y}<extra></extra>"
+            ))
+            fd3.update_layout(xaxis_title="Apogee (m)", yaxis_title="Runs", bargap=0.05)
+            fd3 = styled_fig(fd3)
+            st.plotly_chart(fd3, use_container_width=True, config={"displayModeBar": False}, theme=None)
+            st.markdown('</div>', unsafe_allow_html=True)
+
+        # ── Simulated vs real missions ────────────────────────────────────────
+        st.markdown('<div class="card-title" style="margin-top:24px;">&#128752; Simulated vs Real Missions</div>', unsafe_allow_html=True)
+        st.caption("Every mission passing the Stage 02 filters, flown in one batched simulation with the drag factor above")
+
+        overlay_twr = st.slider("Liftoff Thrust-to-Weight", min_value=1.1, max_value=3.0, value=1.5, step=0.1, key="overlay_twr")
+        if not has_missions:
+            st.info("No missions to fly yet.")
+        else:
+            # The missions left by the Stage 02 filters, as the cached read-only positions of the table
+            overlay_rows = None
+            if not MISSION_DB:
+                overlay_rows = table_order(snapshot, data_version, *filters, None, False)
+                overlay_rows = overlay_rows if len(overlay_rows) < len(df_full) else None
+            overlay_key = (data_version, filters, overlay_twr, drag_val)
+            with st.spinner("Flying missions..."):
+                apogee_km, sim_velocity, reached = mission_apogees(overlay_rows, *overlay_key)
+            n_flown = len(apogee_km)
+
+            om1, om2, om3 = st.columns(3)
+            om1.metric("Missions", f"{n_flown:,}")
+            om2.metric("Reach Target", f"{int(reached.sum()):,} / {n_flown:,}")
+            om3.metric("Median Apogee", f"{np.median(apogee_km):,.1f} km" if n_flown else "—")
+
+            st.markdown('<div style="margin:0 32px;">', unsafe_allow_html=True)
+            st.markdown('<div class="chart-label">Simulated Apogee vs Target Distance</div>', unsafe_allow_html=True)
+            fo = apogee_overlay_fig(overlay_rows, apogee_km, sim_velocity, *overlay_key)
+            st.plotly_chart(fo, use_container_width=True, config={"displayModeBar": False}, theme=None)
+            st.markdown('</div>', unsafe_allow_html=True)
+
     # ─── TAB 5: CRYPTO SIM ───────────────────────────────────────────────────
     with tab5:
         st.markdown("""
@@ -1587,20 +1995,7 @@ else:
             st.caption("Starting price of the simulated asset")
 
         # ── Generate data ─────────────────────────────────────────────────────
-        np.random.seed(42)
-        time_arr_c = np.arange(c_time_steps)
-        sine_component = c_amplitude * np.sin(c_frequency * time_arr_c)
-        drift_component = c_drift * time_arr_c
-        noise_component = np.random.normal(0, c_noise, c_time_steps)
-        price_arr = c_base_price + sine_component + drift_component + noise_component
-
-        # ── Store in DataFrame ────────────────────────────────────────────────
-        crypto_df = pd.DataFrame({
-            "Time":             time_arr_c,
-            "Price":            price_arr,
-            "Drift_Component":  drift_component,
-            "Noise_Component":  noise_component,
-        })
+        crypto_df = generate_prices(c_time_steps, c_amplitude, c_frequency, c_drift, c_noise, c_base_price)
 
         # ── SECTION 2: DataFrame Preview ─────────────────────────────────────
         st.markdown("""
@@ -1655,19 +2050,12 @@ else:
         # ── NOTE: Section 3 (Data Cleaning) has been removed ─────────────────
 
         # ── Compute stats with NumPy/Pandas ───────────────────────────────────
-        crypto_df_clean = crypto_df.copy()
-        crypto_df_clean = crypto_df_clean[crypto_df_clean["Price"] > 0].reset_index(drop=True)
-        crypto_df_clean["Time"] = crypto_df_clean["Time"].astype(int)
-        crypto_df_clean["Price"] = crypto_df_clean["Price"].astype(float)
-        crypto_df_clean["Drift_Component"] = crypto_df_clean["Drift_Component"].astype(float)
-        crypto_df_clean["Noise_Component"] = crypto_df_clean["Noise_Component"].astype(float)
-
-        prices = crypto_df_clean["Price"].values
-        mean_price   = float(np.mean(prices))
-        std_price    = float(np.std(prices))
-        var_price    = float(np.var(prices))
-        returns      = np.diff(prices) / prices[:-1]
-        mean_return  = float(np.mean(returns)) * 100
+        crypto_df_clean = clean_prices(crypto_df)
+        stats = price_stats(crypto_df_clean["Price"].values)
+        mean_price   = stats["mean"]
+        std_price    = stats["std"]
+        var_price    = stats["var"]
+        mean_return  = stats["mean_return"]
 
         # Volatility classification
         if std_price < 5:
@@ -1751,10 +2139,11 @@ else:
             st.markdown('<div class="chart-label">Cryptocurrency Price vs Time</div>', unsafe_allow_html=True)
             st.markdown('<div class="chart-hint">Blue line = simulated price · Fill shows price area under curve</div>', unsafe_allow_html=True)
 
+            p_time, p_price = downsample_minmax(crypto_df_clean["Time"], crypto_df_clean["Price"], CHART_POINTS)
             fig_c = go.Figure()
             fig_c.add_trace(go.Scatter(
-                x=crypto_df_clean["Time"],
-                y=crypto_df_clean["Price"],
+                x=p_time,
+                y=p_price,
                 mode="lines",
                 name="Price",
                 line=dict(color="#00c8ff", width=2),
@@ -1768,7 +2157,7 @@ else:
                 height=360,
             )
             fig_c = styled_fig(fig_c, height=360)
-            st.plotly_chart(fig_c, use_container_width=True, config={"displayModeBar": False})
+            st.plotly_chart(fig_c, use_container_width=True, config={"displayModeBar": False}, theme=None)
 
         else:
             st.markdown('<div class="chart-label">Stable Asset vs Volatile Asset — Price Comparison</div>', unsafe_allow_html=True)
@@ -1780,14 +2169,17 @@ else:
             stable_price   = np.clip(stable_price,   1, None)
             volatile_price = np.clip(volatile_price, 1, None)
 
+            t_stable, stable_price = downsample_minmax(t_comp, stable_price, CHART_POINTS)
+            t_volatile, volatile_price = downsample_minmax(t_comp, volatile_price, CHART_POINTS)
+
             fig_comp = go.Figure()
             fig_comp.add_trace(go.Scatter(
-                x=t_comp, y=stable_price, mode="lines", name="Stable Asset",
+                x=t_stable, y=stable_price, mode="lines", name="Stable Asset",
                 line=dict(color="#00c8ff", width=2),
                 hovertemplate="Time: %{x}<br>Stable: $%{y:.2f}<extra></extra>"
             ))
             fig_comp.add_trace(go.Scatter(
-                x=t_comp, y=volatile_price, mode="lines", name="Volatile Asset",
+                x=t_volatile, y=volatile_price, mode="lines", name="Volatile Asset",
                 line=dict(color="#ffaa40", width=2),
                 hovertemplate="Time: %{x}<br>Volatile: $%{y:.2f}<extra></extra>"
             ))
@@ -1798,7 +2190,7 @@ else:
                 legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
             )
             fig_comp = styled_fig(fig_comp, height=360)
-            st.plotly_chart(fig_comp, use_container_width=True, config={"displayModeBar": False})
+            st.plotly_chart(fig_comp, use_container_width=True, config={"displayModeBar": False}, theme=None)
 
         st.markdown('</div>', unsafe_allow_html=True)
 
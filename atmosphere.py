@@ -0,0 +1,67 @@
+import numpy as np
+
+# ─── US Standard Atmosphere 1976 ──────────────────────────────────────────────
+R_AIR = 287.053         # J/(kg·K)
+G0 = 9.80665            # m/s²
+
+# Layer base altitude (m), base temperature (K), lapse rate (K/m), base pressure (Pa)
+LAYERS = [
+    (0,     288.15, -0.0065, 101325.0),
+    (11000, 216.65,  0.0,     22632.1),
+    (20000, 216.65,  0.001,    5474.89),
+    (32000, 228.65,  0.0028,    868.019),
+    (47000, 270.65,  0.0,       110.906),
+    (51000, 270.65, -0.0028,     66.9389),
+    (71000, 214.65, -0.002,       3.95642),
+]
+TOP_OF_MODEL = 84852.0
+
+TABLE_STEP = 25.0       # m
+TABLE_TOP = 150000.0    # m; density is zero above
+
+
+def _layer_state(dh, temp, lapse, pressure):
+    if lapse == 0:
+        return np.full(np.shape(dh), temp), pressure * np.exp(-G0 * dh / (R_AIR * temp))
+    t = temp + lapse * dh
+    return t, pressure * (t / temp) ** (-G0 / (R_AIR * lapse))
+
+
+def _standard_density(altitude):
+    # Piecewise formulas, only evaluated once to build the lookup table
+    altitude = np.asarray(altitude, dtype=np.float64)
+    rho = np.empty_like(altitude)
+    bounds = [layer[0] for layer in LAYERS[1:]] + [TOP_OF_MODEL]
+    for (base, temp, lapse, pressure), top in zip(LAYERS, bounds):
+        sel = (altitude >= base) & (altitude <= top)
+        t, p = _layer_state(altitude[sel] - base, temp, lapse, pressure)
+        rho[sel] = p / (R_AIR * t)
+    # Above the model top, continue with the top layer's isothermal scale height
+    base, temp, lapse, pressure = LAYERS[-1]
+    t_top, p_top = _layer_state(TOP_OF_MODEL - base, temp, lapse, pressure)
+    above = altitude > TOP_OF_MODEL
+    rho[above] = p_top / (R_AIR * t_top) * np.exp(-(altitude[above] - TOP_OF_MODEL) * G0 / (R_AIR * t_top))
+    return rho
+
+
+# Density relative to sea level on a uniform grid, with per-cell slopes so a
+# lookup is one index computation and one multiply-add
+TABLE_ALTITUDE = np.arange(0.0, TABLE_TOP + TABLE_STEP, TABLE_STEP)
+DENSITY_TABLE = _standard_density(TABLE_ALTITUDE)
+DENSITY_TABLE /= DENSITY_TABLE[0]
+DENSITY_TABLE[-1] = 0.0
+DENSITY_SLOPE = np.append(np.diff(DENSITY_TABLE), 0.0)
+_LAST = DENSITY_TABLE.size - 1
+
+
+def density_ratio(altitude):
+    """Air density at ``altitude`` (m) as a fraction of sea level, by linear table lookup."""
+    pos = np.clip(np.asarray(altitude, dtype=np.float64) / TABLE_STEP, 0.0, _LAST)
+    i = pos.astype(np.intp)
+    return DENSITY_TABLE[i] + DENSITY_SLOPE[i] * (pos - i)
+
+
+def density_gradient(altitude):
+    """Derivative of :func:`density_ratio` with respect to altitude (1/m)."""
+    pos = np.clip(np.asarray(altitude, dtype=np.float64) / TABLE_STEP, 0.0, _LAST)
+    return DENSITY_SLOPE[pos.astype(np.intp)] / TABLE_STEP
@@ -0,0 +1,267 @@
+"""Headless benchmarks for the dashboard's physics and analytics hot paths.
+
+    python benchmarks.py --save baseline.json
+    python benchmarks.py --compare baseline.json      # exit status 1 on a regression
+    python benchmarks.py --check                      # exit status 1 if the target solver is wrong
+
+Each case runs at several data sizes and reports calls per second (best of
+``--repeat`` rounds), the matching rows/steps/launches per second and the peak
+traced memory of one call. Sizes whose single
+call takes longer than ``--time-limit`` seconds end that case early, since the
+larger sizes would only be slower. ``--check`` first compares the Stage 04
+target solver with a brute-force scan of full flights.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from analytics import (
+    KpiCube, MissionIndex, clean_prices, correlation_matrix, filter_missions, generate_prices, mission_table_html,
+    pair_correlations, price_stats,
+)
+from missions import COLUMNS, MissionTable
+from simulation import Trajectory, simulate_adaptive, simulate_batch, solve_minimum
+
+MISSION_SIZES = (12, 1_000, 100_000, 1_000_000)
+PRICE_SIZES = (50, 10_000, 1_000_000, 10_000_000)
+VEHICLES = ("Falcon 9", "New Shepard", "Ariane 5", "Delta IV", "Soyuz", "Atlas V", "H-IIA", "Vega", "Vulcan", "LVM3")
+TARGETS = ("LEO", "GEO", "Moon", "Mars")
+
+
+def synthetic_missions(n, seed=0):
+    """``n`` random missions with the same schema and value ranges as the dashboard dataset."""
+    rng = np.random.default_rng(seed)
+    crewed = rng.random(n) < 0.25
+    return pd.DataFrame({
+        "id": np.arange(1, n + 1),
+        "mission": [f"Mission {i}" for i in range(1, n + 1)],
+        "type": np.where(crewed, "Crewed", "Uncrewed"),
+        "cost": rng.integers(20, 400, n),
+        "payload": rng.integers(2000, 65000, n),
+        "fuel": rng.integers(200000, 1250000, n),
+        "duration": rng.integers(5, 400, n),
+        "crew": np.where(crewed, rng.integers(2, 8, n), 0),
+        "success": rng.random(n) < 0.85,
+        "target": rng.choice(TARGETS, n),
+        "vehicle": rng.choice(VEHICLES, n),
+        "year": rng.integers(2020, 2024, n),
+        "distance": rng.integers(100, 55000000, n),
+    }).astype(COLUMNS)
+
+
+def launch_parameters(n, seed=0):
+    # Uniform over the Stage 04 slider ranges, so the mix of fast and pad-bound lanes matches the dashboard
+    rng = np.random.default_rng(seed)
+    return {
+        "payload": rng.uniform(1000, 50000, n),
+        "thrust": rng.uniform(1e6, 15e6, n),
+        "fuel": rng.uniform(50000, 500000, n),
+        "drag": rng.uniform(1e-5, 1e-3, n),
+    }
+
+
+# ─── Cases: setup(size) builds the inputs and returns the call to time ────────
+def stage2_filter(size):
+    df = synthetic_missions(size)
+    return lambda: filter_missions(df, "Uncrewed", "Falcon 9", (2021, 2023))
+
+
+def stage2_index(size):
+    index = MissionIndex(synthetic_missions(size))
+    return lambda: index.positions("Uncrewed", "Falcon 9", (2021, 2023))
+
+
+def stage2_kpis(size):
+    cube = KpiCube(synthetic_missions(size))
+    return lambda: cube.kpis("Uncrewed", "Falcon 9", (2021, 2023))
+
+
+def ingest_append(size):
+    # Folding 1,000 new rows into a dataset of ``size`` rows should not depend on ``size``.
+    # Each call extends the latest version, as live ingest does, so buffer doubling is amortised
+    base, delta = synthetic_missions(size), synthetic_missions(1000, seed=1)
+    state = [MissionTable().extended(base), MissionIndex(base), KpiCube(base)]
+
+    def run():
+        table, index, cube = state
+        state[:] = [table.extended(delta), index.extended(delta), cube.extended(delta)]
+    return run
+
+
+def stage2_table(size):
+    df = synthetic_missions(size)
+    return lambda: mission_table_html(df)
+
+
+def stage3_corr(size):
+    df = synthetic_missions(size)
+    return lambda: pair_correlations(df)
+
+
+def stage3_matrix(size):
+    df = synthetic_missions(size)
+    return lambda: correlation_matrix(df, "spearman")
+
+
+def stage4_adaptive(size):
+    params = launch_parameters(size)
+
+    def run():
+        for i in range(size):
+            sim = simulate_adaptive(*(params[name][i] for name in ("payload", "thrust", "fuel", "drag")), sample_dt=0.1)
+            Trajectory.from_result(sim)
+    return run
+
+
+def stage4_batch(size):
+    params = launch_parameters(size)
+    return lambda: simulate_batch(**params, history=False)
+
+
+def crypto_prices(size):
+    def run():
+        crypto_df = clean_prices(generate_prices(size, 10.0, 0.1, 0.05, 3.0, 1000))
+        return price_stats(crypto_df["Price"].values)
+    return run
+
+
+CASES = {
+    "stage2_filter": (stage2_filter, MISSION_SIZES),
+    "stage2_index": (stage2_index, MISSION_SIZES),
+    "stage2_kpis": (stage2_kpis, MISSION_SIZES),
+    "ingest_append": (ingest_append, MISSION_SIZES),
+    "stage2_table": (stage2_table, MISSION_SIZES),
+    "stage3_corr": (stage3_corr, MISSION_SIZES),
+    "stage3_matrix": (stage3_matrix, MISSION_SIZES),
+    "stage4_adaptive": (stage4_adaptive, (1, 10, 100)),
+    "stage4_batch": (stage4_batch, (1, 1_000, 100_000)),
+    "crypto_prices": (crypto_prices, PRICE_SIZES),
+}
+
+
+# ─── Solver check: the minimum fuel found must match a brute-force scan ───────
+SOLVER_CHECKS = (
+    ({"payload": 5000, "thrust": 8e6, "drag": 1e-4}, "altitude", 300_000),
+    ({"payload": 20000, "thrust": 6e6, "drag": 3e-4}, "altitude", 100_000),
+    ({"payload": 5000, "thrust": 8e6, "drag": 1e-4}, "velocity", 2_500),
+    ({"payload": 30000, "thrust": 12e6, "drag": 5e-4}, "velocity", 2_000),
+)
+FUEL_RANGE = (50000, 500000)   # the Stage 04 slider range
+
+
+def check_solver(points=181):
+    """Mismatches between ``solve_minimum`` and the first passing fuel of a ``points`` scan of full runs."""
+    lo, hi = FUEL_RANGE
+    scan = np.linspace(lo, hi, points)
+    tolerance = (hi - lo) / (points - 1) + (hi - lo) * 1e-3   # one scan step plus the solver's default xtol
+    mismatches = []
+    for base, quantity, level in SOLVER_CHECKS:
+        found = solve_minimum("fuel", quantity, level, base, lo, hi)["value"]
+        passing = [simulate_adaptive(**base, fuel=fuel)[f"max_{quantity}"] >= level for fuel in scan]
+        expected = float(scan[passing.index(True)]) if any(passing) else None
+        if (found is None) != (expected is None) or (found is not None and abs(found - expected) > tolerance):
+            mismatches.append(f"{quantity} >= {level:,} with {base}: solver {found}, scan {expected}")
+    return mismatches
+
+
+def measure(fn, repeat=3, min_time=0.2):
+    """Best-of-``repeat`` seconds per call, plus the peak traced memory of one call."""
+    start = time.perf_counter()
+    fn()
+    first = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    number = max(1, int(min_time / max(first, 1e-9)))
+    best = first
+    for _ in range(repeat if first < min_time else 0):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best, peak
+
+
+def run(names, repeat=3, time_limit=5.0, max_size=None):
+    results = []
+    for name in names:
+        setup, sizes = CASES[name]
+        for size in sizes:
+            if max_size is not None and size > max_size:
+                break
+            seconds, peak = measure(setup(size), repeat=repeat)
+            results.append({"case": name, "size": size, "ops_per_sec": 1 / seconds, "items_per_sec": size / seconds,
+                            "seconds": seconds, "peak_mb": peak / 2 ** 20})
+            print(f"{name:<16} {size:>10,}  {1 / seconds:>12,.2f} ops/s  {size / seconds:>14,.0f} items/s  "
+                  f"{peak / 2 ** 20:>9.1f} MB", file=sys.stderr)
+            if seconds > time_limit:
+                break
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Entries slower or hungrier than the baseline by more than ``tolerance``."""
+    base = {(r["case"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        b = base.get((r["case"], r["size"]))
+        if b is None:
+            continue
+        if r["ops_per_sec"] < b["ops_per_sec"] * (1 - tolerance):
+            regressions.append(f"{r['case']} @ {r['size']:,}: {r['ops_per_sec']:,.2f} ops/s vs {b['ops_per_sec']:,.2f}")
+        if r["peak_mb"] > b["peak_mb"] * (1 + tolerance) + 1:
+            regressions.append(f"{r['case']} @ {r['size']:,}: {r['peak_mb']:.1f} MB vs {b['peak_mb']:.1f}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard hot paths without a browser.")
+    parser.add_argument("cases", nargs="*", help=f"cases to run (default: all of {', '.join(CASES)})")
+    parser.add_argument("--repeat", type=int, default=3, help="timing rounds per size")
+    parser.add_argument("--time-limit", type=float, default=5.0, help="stop a case after a call slower than this (s)")
+    parser.add_argument("--max-size", type=int, help="skip sizes above this, for a quick run")
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown or memory growth (fraction)")
+    parser.add_argument("--check", action="store_true", help="check the target solver against a brute-force scan first")
+    args = parser.parse_args(argv)
+    unknown = sorted(set(args.cases) - set(CASES))
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+    if args.check:
+        mismatches = check_solver()
+        for line in mismatches:
+            print("SOLVER MISMATCH " + line, file=sys.stderr)
+        if mismatches:
+            sys.exit(1)
+
+    results = run(args.cases or list(CASES), repeat=args.repeat, time_limit=args.time_limit, max_size=args.max_size)
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.platform(),
+        "results": results,
+    }
+    if args.save:
+        with open(args.save, "w") as fh:
+            json.dump(report, fh, indent=2)
+    if args.compare:
+        with open(args.compare) as fh:
+            regressions = compare(results, json.load(fh), args.tolerance)
+        for line in regressions:
+            print("REGRESSION " + line, file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+DEFAULT_POINTS = 400
+WEBGL_POINTS = 2_000      # scatter traces longer than this render through WebGL
+DENSITY_POINTS = 50_000   # point clouds larger than this are sent as a binned density grid
+DENSITY_BINS = (80, 50)
+
+
+def downsample_minmax(x, y, n_out=DEFAULT_POINTS):
+    """Thin an (x, y) series to at most ``n_out`` points without losing its peaks.
+
+    The interior is split into equal buckets and each bucket keeps the samples
+    holding its minimum and maximum, in their original order; the first and last
+    points are always kept. Unlike a fixed stride this never skips an apogee or
+    an acceleration spike, and it is a handful of array operations at any length.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    n = y.size
+    if n <= n_out or n_out < 4:
+        return x, y
+
+    inner = y[1:-1]
+    size = -(-inner.size // ((n_out - 2) // 2))
+    n_buckets = -(-inner.size // size)
+    pad = n_buckets * size - inner.size
+    hi = np.concatenate([inner, np.full(pad, -np.inf)]).reshape(n_buckets, size)
+    lo = np.concatenate([inner, np.full(pad, np.inf)]).reshape(n_buckets, size)
+    start = np.arange(n_buckets) * size + 1
+    idx = np.unique(np.concatenate([[0], start + lo.argmin(axis=1), start + hi.argmax(axis=1), [n - 1]]))
+    return x[idx], y[idx]
+
+
+def density_grid(x, y, bins=DENSITY_BINS, log_x=False, log_y=False):
+    """Count (x, y) points on a regular ``bins`` grid, for a density heatmap.
+
+    Returns the x and y bin edges and a (y, x) array of counts, the layout
+    ``go.Heatmap`` takes, with empty cells as NaN so they render transparent.
+    With ``log_x`` or ``log_y`` that axis is binned evenly in log10 and
+    non-positive values are dropped. The result has a fixed size however many
+    points go in, and building it is one ``bincount``.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    keep = np.isfinite(x) & np.isfinite(y)
+    if log_x:
+        keep &= x > 0
+    if log_y:
+        keep &= y > 0
+    x, y = x[keep], y[keep]
+    if log_x:
+        x = np.log10(x)
+    if log_y:
+        y = np.log10(y)
+
+    nx, ny = bins
+    cells, edges = [], []
+    for values, n in ((x, nx), (y, ny)):
+        lo, hi = (values.min(), values.max()) if values.size else (0.0, 1.0)
+        if hi <= lo:
+            lo, hi = lo - 0.5, hi + 0.5
+        edges.append(np.linspace(lo, hi, n + 1))
+        cells.append(np.minimum(((values - lo) * (n / (hi - lo))).astype(np.intp), n - 1))
+    counts = np.bincount(cells[1] * nx + cells[0], minlength=nx * ny).reshape(ny, nx).astype(np.float64)
+    counts[counts == 0] = np.nan
+    x_edges, y_edges = edges
+    return (10 ** x_edges if log_x else x_edges), (10 ** y_edges if log_y else y_edges), counts
+
+
+# ─── Dashboard theme ──────────────────────────────────────────────────────────
+# Registered once per process; figures pick it up by name instead of re-applying the styling each rerun.
+# It stands alone (no Plotly or Streamlit base), so charts are drawn with ``theme=None`` and also carry
+# the few Streamlit chart defaults the dashboard relied on: no vertical grid, auto margins, the palette.
+THEME = "mission_dark"
+
+_AXIS = dict(
+    gridcolor="rgba(0,80,200,0.1)",
+    linecolor="rgba(0,100,200,0.15)",
+    tickfont=dict(color="#6888aa", size=11),
+    title_font=dict(color="#8aa8d0", size=12),
+    zeroline=False,
+    automargin=True,
+)
+
+pio.templates[THEME] = go.layout.Template(layout=dict(
+    paper_bgcolor="rgba(0,0,0,0)",
+    plot_bgcolor="rgba(0,0,0,0)",
+    font=dict(family="Rajdhani, sans-serif", color="#8aa8d0", size=12),
+    margin=dict(l=10, r=10, t=20, b=10),
+    legend=dict(font=dict(color="#8aa8d0", size=11)),
+    hoverlabel=dict(bgcolor="rgba(4,12,40,0.95)", bordercolor="rgba(0,200,255,0.35)",
+                    font=dict(family="Rajdhani, sans-serif", color="#c8dcff", size=12)),
+    colorway=["#83c9ff", "#0068c9", "#ffabab", "#ff2b2b", "#7defa1",
+              "#29b09d", "#ffd16a", "#ff8700", "#6d3fc0", "#d5dae5"],
+    xaxis=dict(_AXIS, showgrid=False),
+    yaxis=_AXIS,
+))
@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pandas as pd
+
+from analytics import KpiCube, MissionIndex
+from missions import CHUNK_ROWS, MissionFeed, MissionTable
+
+POLL_SECONDS = 2.0
+
+
+class MissionSnapshot:
+    """One consistent version of the ingested missions: the frame, its filter index and KPI cube.
+
+    Snapshots are shared by every session and never modified; the frame is
+    built once, on first use, as read-only views of the table's buffers.
+    """
+
+    __slots__ = ("version", "table", "index", "cube", "_frame")
+
+    def __init__(self, version, table, index, cube):
+        self.version = version
+        self.table = table
+        self.index = index
+        self.cube = cube
+        self._frame = None
+
+    @property
+    def frame(self):
+        if self._frame is None:
+            self._frame = self.table.frame()
+        return self._frame
+
+
+class LiveMissions:
+    """Missions that follow an append-only launch log without full rebuilds.
+
+    ``refresh`` polls the feed at most every ``poll_seconds`` and folds the new
+    rows into the table, index and cube, at a cost proportional to those rows.
+    Every change produces a new snapshot; snapshots already handed out are never
+    modified, so sessions can keep reading them while ingest continues. A log
+    that shrinks or is rewritten is reloaded from scratch, and the reloaded
+    snapshot replaces the old one only once it is complete. A poll that cannot
+    be read keeps the current snapshot and leaves the reason in ``error``; the
+    same rows are retried on the next poll.
+    """
+
+    def __init__(self, path=None, chunk_rows=CHUNK_ROWS, poll_seconds=POLL_SECONDS):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.poll_seconds = poll_seconds
+        self.error = None
+        self._lock = threading.Lock()
+        self._polled = 0.0
+        self._feed = MissionFeed(path, chunk_rows)
+        self.snapshot = self._empty(0)
+        self.refresh(force=True)
+
+    @staticmethod
+    def _empty(version):
+        return MissionSnapshot(version, MissionTable(), MissionIndex(), KpiCube())
+
+    def refresh(self, force=False):
+        """Ingest whatever the log gained since the last poll and return the current snapshot."""
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._polled < self.poll_seconds:
+                return self.snapshot
+            self._polled = now
+            version = self.snapshot.version + 1
+            feed, current = self._feed, self.snapshot
+            try:
+                chunks = feed.poll()
+                if chunks is None:
+                    feed, current = MissionFeed(self.path, self.chunk_rows), self._empty(version)
+                    chunks = feed.poll()
+            except (OSError, ValueError) as exc:
+                self.error = str(exc)
+                return self.snapshot
+            self.error = None
+            self._feed = feed
+            chunks = [chunk for chunk in chunks if len(chunk)]
+            if chunks:
+                delta = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+                current = MissionSnapshot(
+                    version,
+                    current.table.extended(delta),
+                    current.index.extended(delta),
+                    current.cube.extended(delta),
+                )
+            self.snapshot = current
+            return self.snapshot
@@ -0,0 +1,231 @@
+"""SQLite backend for mission analytics on launch logs too large to keep in memory.
+
+    python mission_store.py launches.csv -o missions.db
+    MISSION_DB=missions.db streamlit run app.py
+
+The import streams the log through the same chunked readers as the in-memory
+path, so it never holds more than one chunk. The dashboard then pushes every
+Stage 02 filter, metric and table page and the Stage 03 charts down to indexed
+SQL queries instead of loading the table: aggregate charts get their means,
+correlations and density grids from SQL, and only small selections are read
+as rows.
+"""
+import argparse
+import math
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from analytics import CORR_COLUMNS, CORR_METHODS, correlation_from_products
+from missions import CHUNK_ROWS, COLUMNS, iter_missions
+
+SQL_TYPES = {"object": "TEXT", "category": "TEXT", "bool": "INTEGER"}
+INDEXED = ("type", "vehicle", "year", "success")
+
+
+def create_store(db_path, source=None, chunk_rows=CHUNK_ROWS):
+    """Write the missions from ``source`` (a launch log, or the built-in sample) to a new database."""
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    conn = sqlite3.connect(db_path)
+    try:
+        columns = ", ".join(f"{name} {SQL_TYPES.get(dtype, 'INTEGER')}" for name, dtype in COLUMNS.items())
+        conn.execute(f"CREATE TABLE missions ({columns})")
+        n = 0
+        for chunk in iter_missions(source, chunk_rows):
+            chunk.to_sql("missions", conn, if_exists="append", index=False)
+            n += len(chunk)
+        # Indexes after the bulk load: one sort per index instead of per-row maintenance
+        for name in INDEXED:
+            conn.execute(f"CREATE INDEX missions_{name} ON missions ({name})")
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+    return n
+
+
+class MissionStore:
+    """Read-only queries against a database written by ``create_store``.
+
+    Every method takes the Stage 02 selectors (``"All ..."`` disables one) and
+    turns them into a ``WHERE`` clause over the indexed columns. One connection
+    is shared by every session behind a lock.
+    """
+
+    def __init__(self, db_path):
+        self.path = db_path
+        self._conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+        try:
+            self._conn.execute("SELECT log10(1)")
+        except sqlite3.OperationalError:
+            # SQLite builds without the math functions
+            self._conn.create_function("log10", 1, math.log10, deterministic=True)
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _where(mission_type="All Types", vehicle="All Vehicles", year_range=None, success=None):
+        clauses, params = [], []
+        if mission_type != "All Types":
+            clauses.append("type = ?")
+            params.append(mission_type)
+        if vehicle != "All Vehicles":
+            clauses.append("vehicle = ?")
+            params.append(vehicle)
+        if year_range is not None:
+            clauses.append("year BETWEEN ? AND ?")
+            params.extend(int(y) for y in year_range)
+        if success is not None:
+            clauses.append("success = ?")
+            params.append(int(success))
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    @staticmethod
+    def _check_columns(columns):
+        # Column names are interpolated into the SQL, so only the schema's own are accepted
+        unknown = [name for name in columns if name not in COLUMNS]
+        if unknown:
+            raise ValueError(f"unknown column(s) {', '.join(unknown)}")
+
+    def _frame(self, rows, columns):
+        df = pd.DataFrame.from_records(rows, columns=list(columns))
+        return df.astype({name: COLUMNS[name] for name in columns})
+
+    def options(self):
+        """Vehicle labels and the first and last year, for the Stage 02 selectors."""
+        vehicles = [row[0] for row in self._query("SELECT DISTINCT vehicle FROM missions ORDER BY vehicle")]
+        first, last = self._query("SELECT MIN(year), MAX(year) FROM missions")[0]
+        return vehicles, first, last
+
+    def kpis(self, mission_type="All Types", vehicle="All Vehicles", year_range=None):
+        """Same figures as ``KpiCube.kpis``, aggregated by SQLite; ``None`` when no mission matches."""
+        where, params = self._where(mission_type, vehicle, year_range)
+        count, success, cost, duration = self._query(
+            f"SELECT COUNT(*), SUM(success), SUM(cost), SUM(duration) FROM missions{where}", params)[0]
+        if not count:
+            return None
+        return {
+            "missions": count,
+            "success_rate": success / count * 100,
+            "avg_cost": cost / count,
+            "avg_duration": duration / count,
+        }
+
+    def page(self, mission_type="All Types", vehicle="All Vehicles", year_range=None,
+             sort_column=None, descending=False, limit=25, offset=0):
+        """One table page, sorted like ``analytics.sort_rows`` (ties stay in row order)."""
+        if sort_column is not None and sort_column not in COLUMNS:
+            raise ValueError(f"unknown sort column {sort_column!r}")
+        where, params = self._where(mission_type, vehicle, year_range)
+        order = f"{sort_column} {'DESC' if descending else 'ASC'}, rowid" if sort_column else "rowid"
+        rows = self._query(f"SELECT {', '.join(COLUMNS)} FROM missions{where} ORDER BY {order} LIMIT ? OFFSET ?",
+                           params + [int(limit), int(offset)])
+        return self._frame(rows, COLUMNS)
+
+    def count(self, mission_type="All Types", vehicle="All Vehicles", year_range=None, success=None):
+        """Number of matching missions."""
+        where, params = self._where(mission_type, vehicle, year_range, success)
+        return self._query(f"SELECT COUNT(*) FROM missions{where}", params)[0][0]
+
+    def outcome_means(self, column, mission_type="All Types", vehicle="All Vehicles", year_range=None, success=None):
+        """Mean of ``column`` over successful and failed matching missions; 0 for an empty group."""
+        self._check_columns([column])
+        where, params = self._where(mission_type, vehicle, year_range, success)
+        means = dict(self._query(f"SELECT success, AVG({column}) FROM missions{where} GROUP BY success", params))
+        return [means.get(1, 0), means.get(0, 0)]
+
+    def correlations(self, method="pearson", mission_type="All Types", vehicle="All Vehicles", year_range=None,
+                     success=None, columns=CORR_COLUMNS):
+        """Same frame as ``analytics.correlation_matrix``, from sums SQLite aggregates over the matches.
+
+        The cross-products are summed around the column means, so large values do
+        not cancel. Spearman ranks come from one sorted window per column: a tie
+        group's average rank is the mean of its first rank and the count up to
+        its last row, and the ranks' mean is (n + 1) / 2.
+        """
+        if method not in CORR_METHODS:
+            raise ValueError(f"unknown correlation method {method!r}")
+        columns = list(columns)
+        self._check_columns(columns)
+        where, params = self._where(mission_type, vehicle, year_range, success)
+        source = f"SELECT {', '.join(columns)} FROM missions{where}"
+        if method == "spearman":
+            n = self._query(f"SELECT COUNT(*) FROM missions{where}", params)[0][0]
+            means = [(n + 1) / 2] * len(columns)
+            source = "SELECT " + ", ".join(
+                f"(RANK() OVER (ORDER BY {name}) + COUNT(*) OVER (ORDER BY {name})) / 2.0 AS {name}"
+                for name in columns) + f" FROM missions{where}"
+        else:
+            n, *means = self._query(
+                f"SELECT COUNT(*), {', '.join(f'AVG({name})' for name in columns)} FROM missions{where}", params)[0]
+        products = np.zeros((len(columns), len(columns)))
+        if n >= 2:
+            pairs = [(i, j) for i in range(len(columns)) for j in range(i, len(columns))]
+            sums = self._query(
+                "SELECT " + ", ".join(f"SUM(({columns[i]} - ?) * ({columns[j]} - ?))" for i, j in pairs)
+                + f" FROM ({source})",
+                [value for i, j in pairs for value in (means[i], means[j])] + params)[0]
+            for (i, j), total in zip(pairs, sums):
+                products[i, j] = products[j, i] = total
+        return correlation_from_products(products, columns)
+
+    def density(self, x, y, bins, mission_type="All Types", vehicle="All Vehicles", year_range=None, success=None,
+                log_x=False, log_y=False):
+        """Same grid as ``charts.density_grid``, counted by SQLite with one ``GROUP BY`` over the cells."""
+        self._check_columns([x, y])
+        where, params = self._where(mission_type, vehicle, year_range, success)
+        clauses = [f"{x} IS NOT NULL", f"{y} IS NOT NULL"] + [f"{name} > 0" for name, log in ((x, log_x), (y, log_y))
+                                                               if log]
+        where = (where + " AND " if where else " WHERE ") + " AND ".join(clauses)
+        values = [f"log10({name})" if log else name for name, log in ((x, log_x), (y, log_y))]
+        bounds = self._query(f"SELECT MIN({values[0]}), MAX({values[0]}), MIN({values[1]}), MAX({values[1]}) "
+                             f"FROM missions{where}", params)[0]
+
+        nx, ny = bins
+        cells, cell_params, edges = [], [], []
+        for value, n, (lo, hi) in zip(values, (nx, ny), (bounds[:2], bounds[2:])):
+            lo, hi = (lo, hi) if lo is not None else (0.0, 1.0)
+            if hi <= lo:
+                lo, hi = lo - 0.5, hi + 0.5
+            edges.append(np.linspace(lo, hi, n + 1))
+            cells.append(f"MIN(CAST(({value} - ?) * ? AS INTEGER), {n - 1})")
+            cell_params.extend([lo, n / (hi - lo)])
+        counts = np.full((ny, nx), np.nan)
+        for cx, cy, count in self._query(f"SELECT {cells[0]} AS cx, {cells[1]} AS cy, COUNT(*) FROM missions{where} "
+                                         f"GROUP BY cx, cy", cell_params + params):
+            counts[cy, cx] = count
+        x_edges, y_edges = edges
+        return (10 ** x_edges if log_x else x_edges), (10 ** y_edges if log_y else y_edges), counts
+
+    def select(self, mission_type="All Types", vehicle="All Vehicles", year_range=None, success=None, columns=None):
+        """Matching missions as a typed frame, restricted to ``columns`` (default: all)."""
+        columns = list(columns or COLUMNS)
+        self._check_columns(columns)
+        where, params = self._where(mission_type, vehicle, year_range, success)
+        rows = self._query(f"SELECT {', '.join(columns)} FROM missions{where} ORDER BY rowid", params)
+        return self._frame(rows, columns)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the SQLite mission store from a launch log.")
+    parser.add_argument("input", nargs="?", help="CSV or Parquet launch log (default: the built-in sample)")
+    parser.add_argument("-o", "--output", required=True, help="database file to (re)create")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="rows read and inserted at a time")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    n = create_store(args.output, args.input, chunk_rows=args.chunk_rows)
+    print(f"{n:,} missions -> {args.output} in {time.perf_counter() - start:.2f} s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+import io
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# ─── Schema ───────────────────────────────────────────────────────────────────
+# Only these columns are read; anything else in a launch log is skipped at parse time.
+# Labels are categoricals, so filters compare integer codes; success is a flag.
+COLUMNS = {
+    "id":       "int32",
+    "mission":  "object",
+    "type":     "category",
+    "cost":     "int32",     # $M
+    "payload":  "int32",     # kg
+    "fuel":     "int32",     # L
+    "duration": "int16",     # days
+    "crew":     "int8",
+    "success":  "bool",
+    "target":   "category",
+    "vehicle":  "category",
+    "year":     "int16",
+    "distance": "int32",     # km
+}
+# Launch logs spell success as Yes/No; parse it as a categorical and flag these values
+SUCCESS_VALUES = ("Yes", "yes", "YES", "True", "true", "1")
+READ_DTYPES = dict(COLUMNS, success="category")
+CHUNK_ROWS = 100_000
+HEAD_BYTES = 4096  # leading bytes of a tailed CSV log kept to recognise a rewrite
+
+# Built-in dataset used when no launch log is configured
+SAMPLE_MISSIONS = [
+    {"id": 1,  "mission": "SpaceX Crew-1",          "type": "Crewed",   "cost": 62,  "payload": 5800,  "fuel": 450000,  "duration": 28,  "crew": 4, "success": "Yes", "target": "LEO",  "vehicle": "Falcon 9",  "year": 2020, "distance": 408},
+    {"id": 2,  "mission": "Blue Origin New Shepard", "type": "Uncrewed", "cost": 28,  "payload": 3600,  "fuel": 280000,  "duration": 10,  "crew": 0, "success": "Yes", "target": "LEO",  "vehicle": "New Shepard","year": 2021, "distance": 100},
+    {"id": 3,  "mission": "Ariane 5 ECA",            "type": "Uncrewed", "cost": 165, "payload": 10200, "fuel": 650000,  "duration": 45,  "crew": 0, "success": "Yes", "target": "GEO",  "vehicle": "Ariane 5",  "year": 2022, "distance": 36000},
+    {"id": 4,  "mission": "Delta IV Heavy",           "type": "Uncrewed", "cost": 350, "payload": 28800, "fuel": 950000,  "duration": 180, "crew": 0, "success": "Yes", "target": "Moon", "vehicle": "Delta IV",   "year": 2023, "distance": 384400},
+    {"id": 5,  "mission": "SpaceX Falcon Heavy",      "type": "Uncrewed", "cost": 90,  "payload": 63800, "fuel": 1200000, "duration": 365, "crew": 0, "success": "Yes", "target": "Mars", "vehicle": "Falcon 9",  "year": 2021, "distance": 54600000},
+    {"id": 6,  "mission": "Soyuz MS-19",              "type": "Crewed",   "cost": 45,  "payload": 7500,  "fuel": 380000,  "duration": 180, "crew": 3, "success": "Yes", "target": "LEO",  "vehicle": "Soyuz",     "year": 2022, "distance": 408},
+    {"id": 7,  "mission": "Atlas V 541",              "type": "Uncrewed", "cost": 185, "payload": 8900,  "fuel": 620000,  "duration": 60,  "crew": 0, "success": "No",  "target": "GEO",  "vehicle": "Atlas V",   "year": 2020, "distance": 35800},
+    {"id": 8,  "mission": "JAXA H-IIA",               "type": "Uncrewed", "cost": 75,  "payload": 4200,  "fuel": 400000,  "duration": 25,  "crew": 0, "success": "Yes", "target": "LEO",  "vehicle": "H-IIA",     "year": 2023, "distance": 450},
+    {"id": 9,  "mission": "SpaceX Crew-2",            "type": "Crewed",   "cost": 60,  "payload": 5900,  "fuel": 460000,  "duration": 28,  "crew": 4, "success": "Yes", "target": "LEO",  "vehicle": "Falcon 9",  "year": 2021, "distance": 410},
+    {"id": 10, "mission": "Vega C",                   "type": "Uncrewed", "cost": 32,  "payload": 2500,  "fuel": 240000,  "duration": 15,  "crew": 0, "success": "Yes", "target": "LEO",  "vehicle": "Vega",      "year": 2022, "distance": 500},
+    {"id": 11, "mission": "ULA Vulcan",               "type": "Uncrewed", "cost": 110, "payload": 9600,  "fuel": 700000,  "duration": 50,  "crew": 0, "success": "No",  "target": "Moon", "vehicle": "Vulcan",    "year": 2023, "distance": 380000},
+    {"id": 12, "mission": "ISRO LVM3",                "type": "Uncrewed", "cost": 40,  "payload": 6000,  "fuel": 420000,  "duration": 30,  "crew": 0, "success": "Yes", "target": "LEO",  "vehicle": "LVM3",      "year": 2021, "distance": 600},
+]
+
+
+# ─── Loaders ──────────────────────────────────────────────────────────────────
+def _check_columns(path, available):
+    missing = [name for name in COLUMNS if name not in available]
+    if missing:
+        raise ValueError(f"{path}: missing column(s) {', '.join(missing)}")
+
+
+def _typed(chunk):
+    """Cast one chunk to ``COLUMNS``, turning the success labels into a boolean flag."""
+    success = chunk["success"]
+    if not pd.api.types.is_bool_dtype(success):
+        success = success.astype("category").isin(SUCCESS_VALUES)
+    chunk = chunk.drop(columns="success").astype({name: dtype for name, dtype in COLUMNS.items() if name != "success"})
+    chunk.insert(list(COLUMNS).index("success"), "success", success.to_numpy(dtype=bool))
+    return chunk
+
+
+def _concat(chunks):
+    # Chunks see different label sets; union the categories instead of letting concat fall back to object
+    if not chunks:
+        return empty_frame()
+    columns = {}
+    for name, dtype in COLUMNS.items():
+        if dtype == "category":
+            columns[name] = union_categoricals([chunk[name] for chunk in chunks])
+        else:
+            columns[name] = np.concatenate([chunk[name].to_numpy() for chunk in chunks])
+    return pd.DataFrame(columns).astype({name: dtype for name, dtype in COLUMNS.items() if dtype != "category"})
+
+
+def read_csv(path, chunk_rows=CHUNK_ROWS):
+    header = pd.read_csv(path, nrows=0).columns
+    _check_columns(path, header)
+    for chunk in pd.read_csv(path, usecols=list(COLUMNS), dtype=READ_DTYPES, chunksize=chunk_rows):
+        yield _typed(chunk)
+
+
+def read_parquet(path, chunk_rows=CHUNK_ROWS):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet launch logs need pyarrow; install it or convert the file to CSV")
+    pf = pq.ParquetFile(path)
+    _check_columns(path, pf.schema_arrow.names)
+    for batch in pf.iter_batches(batch_size=chunk_rows, columns=list(COLUMNS)):
+        yield _typed(batch.to_pandas())
+
+
+LOADERS = {".csv": read_csv, ".parquet": read_parquet}
+
+
+def register_loader(extension, reader):
+    """Route files ending in ``extension`` to ``reader(path, chunk_rows)``, which yields frames typed like ``COLUMNS``."""
+    LOADERS[extension.lower()] = reader
+
+
+def empty_frame():
+    return pd.DataFrame({name: pd.Series(dtype=dtype) for name, dtype in COLUMNS.items()})
+
+
+def source_version(path):
+    """Identity of the file behind ``path``; it changes whenever the file is rewritten."""
+    if not path:
+        return None
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def iter_missions(path=None, chunk_rows=CHUNK_ROWS):
+    """Typed chunks of at most ``chunk_rows`` missions from a launch log, or the built-in sample without ``path``."""
+    if not path:
+        yield _typed(pd.DataFrame(SAMPLE_MISSIONS, columns=list(COLUMNS)))
+        return
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in LOADERS:
+        raise ValueError(f"{path}: no loader for {extension or 'files without an extension'}; "
+                         f"expected one of {', '.join(LOADERS)}")
+    yield from LOADERS[extension](path, chunk_rows)
+
+
+def load_missions(path=None, chunk_rows=CHUNK_ROWS):
+    """Mission records from a CSV or Parquet launch log, or the built-in sample without ``path``.
+
+    Files are read ``chunk_rows`` at a time with the ``COLUMNS`` projection and
+    dtypes, so memory stays near the size of the final, compactly typed frame.
+    """
+    return _concat(list(iter_missions(path, chunk_rows)))
+
+
+class MissionFeed:
+    """New mission records from an append-only launch log.
+
+    ``path`` may be a CSV file that grows (only the bytes after the last
+    complete line read so far are parsed), a directory that receives new CSV or
+    Parquet files (each file is read once, so move files in complete), any
+    other supported file (re-read only when it is rewritten) or ``None`` for the
+    built-in sample.
+
+    A CSV log counts as rewritten when it is replaced by another file, shrinks,
+    or no longer starts with the bytes already read. A poll that fails to parse
+    raises and leaves the feed where it was, so the same rows are retried on the
+    next poll rather than skipped.
+    """
+
+    def __init__(self, path=None, chunk_rows=CHUNK_ROWS):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self._offset = 0
+        self._header = None
+        self._identity = None
+        self._head = b""
+        self._seen = set()
+        self._version = None
+
+    def poll(self):
+        """Typed chunks added since the last call, or ``None`` if the log was rewritten and must be read again."""
+        if not self.path:
+            first, self._version = self._version is None, "sample"
+            return list(iter_missions(None)) if first else []
+        if os.path.isdir(self.path):
+            return self._poll_directory()
+        if self.path.lower().endswith(".csv"):
+            return self._poll_csv()
+        version = source_version(self.path)
+        if version == self._version:
+            return []
+        if self._version is not None:
+            return None
+        chunks = list(iter_missions(self.path, self.chunk_rows))
+        self._version = version
+        return chunks
+
+    def _poll_directory(self):
+        names = sorted(name for name in os.listdir(self.path)
+                       if os.path.splitext(name)[1].lower() in LOADERS and name not in self._seen)
+        chunks = []
+        for name in names:
+            chunks.extend(iter_missions(os.path.join(self.path, name), self.chunk_rows))
+        self._seen.update(names)
+        return chunks
+
+    def _poll_csv(self):
+        stat = os.stat(self.path)
+        identity = (stat.st_dev, stat.st_ino)
+        if self._identity is not None and (identity != self._identity or stat.st_size < self._offset):
+            return None
+        if stat.st_size == self._offset:
+            return []
+        with open(self.path, "rb") as fh:
+            head = fh.read(min(stat.st_size, HEAD_BYTES))
+            if not head.startswith(self._head):
+                return None
+            fh.seek(self._offset)
+            data = fh.read(stat.st_size - self._offset)
+        # A writer may be mid-line: stop at the last newline and pick the rest up next time
+        data = data[:data.rfind(b"\n") + 1]
+        if not data:
+            return []
+        header, offset = self._header, self._offset
+        if header is None:
+            line, _, data = data.partition(b"\n")
+            header = pd.read_csv(io.BytesIO(line + b"\n"), nrows=0).columns.tolist()
+            _check_columns(self.path, header)
+            offset += len(line) + 1
+        chunks = []
+        if data.strip():
+            reader = pd.read_csv(io.BytesIO(data), header=None, names=header, usecols=list(COLUMNS),
+                                 dtype=READ_DTYPES, chunksize=self.chunk_rows)
+            chunks = [_typed(chunk) for chunk in reader]
+        # Only a fully parsed delta moves the feed forward
+        self._header, self._offset, self._identity = header, offset + len(data), identity
+        self._head = head[:min(self._offset, HEAD_BYTES)]
+        return chunks
+
+
+# ─── Append-only storage ──────────────────────────────────────────────────────
+def extend_buffer(buffer, size, values):
+    """Write ``values`` after the first ``size`` entries of ``buffer`` and return the buffer holding them.
+
+    Buffers are over-allocated and double when full, so appends cost O(len(values))
+    amortised. Entries before ``size`` are never touched, so views of that prefix
+    taken earlier stay valid.
+    """
+    need = size + len(values)
+    if need > len(buffer):
+        grown = np.empty(max(need, 2 * len(buffer), 1024), dtype=buffer.dtype)
+        grown[:size] = buffer[:size]
+        buffer = grown
+    buffer[size:need] = values
+    return buffer
+
+
+def _code_dtype(n_categories):
+    # The code width pandas picks for this many categories, so wrapping the buffer needs no cast
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+class MissionTable:
+    """Missions in append-only column buffers, typed like ``COLUMNS``.
+
+    ``extended`` returns a new table with more rows and leaves this one as it
+    was, sharing every buffer, so each version costs only the appended rows.
+    ``frame`` wraps the filled prefix of the buffers without copying, as
+    read-only arrays, so one frame can be shared by every session.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self._columns = {}
+        self._categories = {}
+        for name, dtype in COLUMNS.items():
+            if dtype == "category":
+                self._categories[name] = pd.Index([], dtype=object)
+                self._columns[name] = np.empty(0, dtype=_code_dtype(0))
+            else:
+                self._columns[name] = np.empty(0, dtype=dtype)
+
+    def extended(self, chunk):
+        """A table holding these rows followed by the typed ``chunk``."""
+        out = MissionTable.__new__(MissionTable)
+        out.n = self.n + len(chunk)
+        out._columns = dict(self._columns)
+        out._categories = dict(self._categories)
+        for name, dtype in COLUMNS.items():
+            values = chunk[name]
+            if dtype == "category":
+                labels = pd.Categorical(values)
+                categories = self._categories[name].append(labels.categories.difference(self._categories[name]))
+                codes = categories.get_indexer(labels.categories)[labels.codes]
+                codes[labels.codes < 0] = -1
+                buffer = self._columns[name]
+                if buffer.dtype != _code_dtype(len(categories)):
+                    buffer = buffer[:self.n].astype(_code_dtype(len(categories)))
+                out._columns[name] = extend_buffer(buffer, self.n, codes)
+                out._categories[name] = categories
+            else:
+                out._columns[name] = extend_buffer(self._columns[name], self.n, values.to_numpy(dtype=dtype))
+        return out
+
+    def frame(self):
+        columns = {}
+        for name, dtype in COLUMNS.items():
+            values = self._columns[name][:self.n]
+            values.flags.writeable = False
+            if dtype == "category":
+                values = pd.Categorical.from_codes(values, categories=self._categories[name])
+            columns[name] = pd.Series(values, dtype=None if dtype == "category" else dtype, copy=False)
+        return pd.DataFrame(columns, copy=False)
@@ -0,0 +1,145 @@
+import hashlib
+import inspect
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from simulation import MODEL_VERSION
+
+
+def _nbytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(_nbytes(v) for v in value.values()) + 64 * len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(_nbytes(v) for v in value) + 8 * len(value)
+    return 32
+
+
+def _freeze(result):
+    # Cached results are shared between sessions: make their arrays read-only
+    for value in result.values():
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+    return result
+
+
+class ResultCache:
+    """Content-addressed LRU cache for simulation results.
+
+    Keys hash the simulation function, every argument after defaults are applied
+    (so integrator settings are part of the key) and ``MODEL_VERSION``. Entries
+    are evicted least-recently-used first once ``max_bytes`` is exceeded. With a
+    ``path`` each result is also written there as ``<key>.npz`` and reloaded on a
+    memory miss, so repeat configurations survive a server restart; the directory
+    is pruned oldest-first against the same byte budget.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, path=None):
+        self.max_bytes = max_bytes
+        self.path = path
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+        if path:
+            os.makedirs(path, exist_ok=True)
+
+    def key(self, fn, **kwargs):
+        bound = inspect.signature(fn).bind(**kwargs)
+        bound.apply_defaults()
+        args = {name: float(v) if isinstance(v, (int, float, np.number)) and not isinstance(v, bool) else v
+                for name, v in bound.arguments.items()}
+        blob = json.dumps([fn.__module__, fn.__qualname__, MODEL_VERSION, args], sort_keys=True, default=repr)
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    def get_or_compute(self, fn, **kwargs):
+        key = self.key(fn, **kwargs)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+        result = self._load(key)
+        if result is None:
+            self.misses += 1
+            result = fn(**kwargs)
+            self._store(key, result)
+        else:
+            self.hits += 1
+        result = _freeze(result)
+        self._insert(key, result)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _insert(self, key, result):
+        size = _nbytes(result)
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = (result, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    # ── On-disk store ────────────────────────────────────────────────────────
+    def _file(self, key):
+        return os.path.join(self.path, key + ".npz")
+
+    def _load(self, key):
+        if not self.path or not os.path.exists(self._file(key)):
+            return None
+        try:
+            with np.load(self._file(key), allow_pickle=False) as data:
+                result = json.loads(str(data["__meta__"]))
+                result.update({name: data[name] for name in data.files if name != "__meta__"})
+            os.utime(self._file(key))
+        except (OSError, ValueError, KeyError):
+            return None
+        if "events" in result:
+            result["events"] = {name: tuple(e) for name, e in result["events"].items()}
+        return result
+
+    def _store(self, key, result):
+        if not self.path:
+            return
+        arrays = {name: v for name, v in result.items() if isinstance(v, np.ndarray)}
+        meta = {name: v for name, v in result.items() if not isinstance(v, np.ndarray)}
+        tmp = f"{self._file(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as fh:
+            np.savez(fh, __meta__=np.array(json.dumps(meta)), **arrays)
+        os.replace(tmp, self._file(key))
+        self._prune()
+
+    def _prune(self):
+        # Other sessions may be writing or pruning concurrently; losing a race only skips a file
+        try:
+            entries = [e for e in os.scandir(self.path) if e.name.endswith(".npz")]
+            stats = sorted((e.stat().st_mtime, e.stat().st_size, e.path) for e in entries)
+        except OSError:
+            return
+        total = sum(size for _, size, _ in stats)
+        for _, size, f in stats[:-1]:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(f)
+            except OSError:
+                pass
+            total -= size
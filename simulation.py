@@ -0,0 +1,742 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from atmosphere import density_gradient, density_ratio
+
+# ─── Physical constants ───────────────────────────────────────────────────────
+GRAVITY = 9.81          # m/s²
+DRY_MASS = 5000.0       # kg, vehicle structure without payload or propellant
+BURN_RATE = 1 / 1000    # kg of propellant burned per N·s of thrust
+DT = 0.1                # s
+MAX_STEPS = 1_000_000   # hard ceiling for fixed-step runs without a time limit
+HISTORY_BLOCK = 1024
+DRAG_TOLERANCE = 1e-6   # drag below this fraction of weight is flown in closed form
+FAST_CHECK_EVERY = 50   # steps between checks for lanes that can skip ahead
+
+# Bump whenever the physics changes so cached results from older models are not reused
+MODEL_VERSION = 3
+
+
+def as_lanes(payload, thrust, fuel, drag):
+    """Broadcast the four launch parameters to flat float64 arrays, one entry per lane."""
+    arrays = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in (payload, thrust, fuel, drag)))
+    return [a.ravel().copy() for a in arrays]
+
+
+def _digamma(x):
+    # Asymptotic series once every argument is shifted above 20; good to ~1e-13
+    x = np.array(x, dtype=np.float64)
+    shift = np.zeros_like(x)
+    small = x < 20
+    while small.any():
+        shift[small] += 1 / x[small]
+        x[small] += 1
+        small = x < 20
+    inv2 = 1 / (x * x)
+    return np.log(x) - 0.5 / x - inv2 * (1 / 12 - inv2 * (1 / 120 - inv2 / 252)) - shift
+
+
+def _ballistic(k, h0, v0, mass, thrust, burn_step, k_burn, dt):
+    """State ``k`` Euler steps on from ``(h0, v0)`` with drag neglected, in closed form.
+
+    The first ``k_burn`` steps are at full thrust, the rest a coast under constant
+    gravity. Powered steps follow the discrete rocket equation: the velocity gained
+    is ``thrust·dt·Σ 1/m`` over the burning steps, which is a difference of digammas.
+    Returns altitude, velocity and acceleration arrays.
+    """
+    kp, k_burn, mass, burn_step = np.broadcast_arrays(np.minimum(k, k_burn), k_burn, mass, burn_step)
+    b = np.where(k_burn > 0, burn_step, 1.0)
+    x = mass / b
+    inv_mass = np.zeros(kp.shape)
+    lit = kp > 0
+    if lit.any():
+        inv_mass[lit] = (_digamma(x[lit] + 1) - _digamma(x[lit] - kp[lit] + 1)) / b[lit]
+    vp = v0 + dt * thrust * inv_mass - GRAVITY * dt * kp
+    hp = h0 + dt * kp * v0 + dt * dt * (thrust * ((kp - x) * inv_mass + kp / b) - GRAVITY * kp * (kp + 1) / 2)
+    j = k - kp
+    velocity = vp - GRAVITY * dt * j
+    altitude = hp + dt * j * vp - GRAVITY * dt * dt * j * (j + 1) / 2
+    accel = np.where(k <= k_burn, thrust / (mass - (kp - 1) * b) - GRAVITY, -GRAVITY)
+    return altitude, velocity, accel
+
+
+def _first_step_below(level, h0, v0, dt):
+    # First coast step after which altitude is below `level`, starting from h0 >= level
+    a = GRAVITY * dt * dt / 2
+    b = dt * v0 - a
+    k = np.floor((b + np.sqrt(b * b + 4 * a * (h0 - level))) / (2 * a)) + 1
+    # Snap to the exact discrete crossing in case the root rounded across an integer
+    k = np.where((k > 1) & (h0 + b * (k - 1) - a * (k - 1) ** 2 < level), k - 1, k)
+    return np.where(h0 + b * k - a * k * k >= level, k + 1, k)
+
+
+def _segment_maxima(k_last, h0, v0, mass, thrust, burn_step, k_burn, dt):
+    # Powered flight climbs and speeds up monotonically and the coast is a parabola,
+    # so each maximum over steps 1..k_last sits at the first step, burnout or the apex
+    vb = _ballistic(k_burn, h0, v0, mass, thrust, burn_step, k_burn, dt)[1]
+    apex = k_burn + np.floor(np.maximum(vb / (GRAVITY * dt) - 0.5, 0.0))
+    k = np.clip(np.stack([np.ones_like(k_last), k_burn, apex, apex + 1, k_last]), 1, np.maximum(k_last, 1))
+    altitude, velocity, accel = _ballistic(k, h0, v0, mass, thrust, burn_step, k_burn, dt)
+    return altitude.max(axis=0), velocity.max(axis=0), accel.max(axis=0)
+
+
+def simulate_batch(payload, thrust, fuel, drag, dt=DT, max_time=None, history=True, record_every=1, history_dtype=np.float64):
+    """Advance every (payload, thrust, fuel, drag) lane at once with the Stage 04 Euler scheme.
+
+    Each lane burns until its fuel runs out and flies until it hits the ground, or
+    until ``max_time`` elapses when one is given. Finished lanes are dropped from
+    the working set, so a sweep gets cheaper as lanes land. With ``history=True``
+    the altitude, velocity and acceleration series are returned as ``(lanes,
+    samples)`` arrays, one sample every ``record_every`` steps, padded with NaN
+    after each lane lands; otherwise only the per-lane summary is kept.
+
+    Where drag is negligible (below ``DRAG_TOLERANCE`` of weight) a lane skips ahead
+    on the closed-form solution of the same Euler scheme: a drag-free lane is
+    flown from launch to impact in one evaluation, and a lane coasting up through
+    thin air jumps over its arc until it falls back to where it left.
+    """
+    payload, thrust, fuel, drag = as_lanes(payload, thrust, fuel, drag)
+    n_lanes = payload.size
+    n_total = int(round(max_time / dt)) if max_time is not None else MAX_STEPS
+
+    steps = np.zeros(n_lanes, dtype=np.int64)
+    burnout_time = np.full(n_lanes, np.nan)
+    max_altitude = np.zeros(n_lanes)
+    max_velocity = np.zeros(n_lanes)
+    peak_accel = np.zeros(n_lanes)
+
+    # Working set: state of the lanes still in flight, indexed back through `idx`.
+    # Running maxima live in the working set and are written out as lanes land.
+    # `offset` counts the steps a lane skipped in closed form, so lanes keep their own clocks.
+    idx = np.arange(n_lanes)
+    mass = DRY_MASS + payload + fuel
+    fuel_mass = fuel.copy()
+    velocity = np.zeros(n_lanes)
+    altitude = np.zeros(n_lanes)
+    burning = fuel_mass > 0
+    burn_step = thrust * dt * BURN_RATE
+    run_alt = np.full(n_lanes, -np.inf)
+    run_vel = np.full(n_lanes, -np.inf)
+    run_acc = np.full(n_lanes, -np.inf)
+    offset = np.zeros(n_lanes, dtype=np.int64)
+    any_burning = bool(burning.any())
+    # History is a (3, rows, lanes) buffer that doubles as needed since the flight length
+    # is not known up front; `segments` keeps each closed-form stretch to fill in at the end
+    hist = np.full((3, HISTORY_BLOCK if history else 0, n_lanes), np.nan, dtype=history_dtype)
+    segments = []
+
+    def flush(sel, n_steps):
+        steps[idx[sel]] = n_steps
+        max_altitude[idx[sel]] = run_alt[sel]
+        max_velocity[idx[sel]] = run_vel[sel]
+        peak_accel[idx[sel]] = run_acc[sel]
+
+    def compact(keep):
+        nonlocal idx, mass, fuel_mass, velocity, altitude, burning, burn_step, thrust, drag, run_alt, run_vel, run_acc, offset
+        idx, mass, fuel_mass, velocity, altitude = idx[keep], mass[keep], fuel_mass[keep], velocity[keep], altitude[keep]
+        burning, burn_step, thrust, drag = burning[keep], burn_step[keep], thrust[keep], drag[keep]
+        run_alt, run_vel, run_acc, offset = run_alt[keep], run_vel[keep], run_acc[keep], offset[keep]
+
+    def closed_form(n_steps, launch):
+        # Lanes whose drag is negligible, for the rest of the flight or for the next
+        # climb-and-fall arc, skip ahead on the exact drag-free solution of this scheme
+        eligible = ~burning
+        k_burn = np.zeros(idx.size)
+        hb, vb, m_end = altitude, velocity, mass
+        if launch:
+            lit = burning & (thrust > mass * GRAVITY)
+            k_burn[lit] = np.ceil(fuel_mass[lit] / burn_step[lit] * (1 - 1e-12))
+            hb, vb, _ = _ballistic(k_burn, altitude, velocity, mass, thrust, burn_step, k_burn, dt)
+            m_end = mass - fuel_mass * lit
+            eligible |= lit
+        limit = DRAG_TOLERANCE * m_end * GRAVITY
+        # Speed never exceeds the vacuum impact speed and density never exceeds sea level...
+        finish = eligible & (drag * (vb * vb + 2 * GRAVITY * hb) <= limit)
+        # ...and a lane climbing through thin air falls back to this altitude at this speed
+        arc = ~burning & ~finish & (velocity > 0) & (drag * density_ratio(altitude) * velocity * velocity <= limit)
+        c = np.flatnonzero(finish | arc)
+        if c.size == 0:
+            return
+        h0, v0, k_burn, hb, vb = altitude[c], velocity[c], k_burn[c], hb[c], vb[c]
+        f = finish[c]
+        k_end = np.empty(c.size)
+        k_end[f] = k_burn[f] + _first_step_below(0.0, hb[f], vb[f], dt) - 1
+        # Skips are whole sampling periods so every lane still records on the same steps
+        k_end[~f] = (_first_step_below(h0[~f], h0[~f], v0[~f], dt) - 1) // quantum * quantum
+        s = np.flatnonzero(f | (k_end > 0))
+        if s.size == 0:
+            return
+
+        c, k_end, k_burn, f = c[s], k_end[s], k_burn[s], f[s]
+        seg = (h0[s], v0[s], mass[c], thrust[c], burn_step[c], k_burn)
+        n_done = n_steps + offset[c]
+        k_last = np.minimum(k_end, n_total - n_done)
+        hi, vi, ai = _segment_maxima(k_last, *seg, dt)
+        flown = k_last > 0
+        run_alt[c] = np.where(flown, np.maximum(run_alt[c], hi), run_alt[c])
+        run_vel[c] = np.where(flown, np.maximum(run_vel[c], vi), run_vel[c])
+        run_acc[c] = np.where(flown, np.maximum(run_acc[c], ai), run_acc[c])
+        if history:
+            segments.append((idx[c], n_done, k_last) + seg)
+
+        # Finished lanes (and arcs that run out of time) leave; the rest rejoin the loop
+        ends = f | (n_done + k_end >= n_total)
+        lit = ends & (k_burn > 0) & (k_burn <= k_last)
+        burnout_time[idx[c[lit]]] = (n_done[lit] + k_burn[lit]) * dt
+        back = ~ends
+        altitude[c[back]], velocity[c[back]], _ = _ballistic(k_end[back], *(x[back] for x in seg), dt)
+        offset[c[back]] += k_end[back].astype(np.int64)
+        if ends.any():
+            done = np.zeros(idx.size, dtype=bool)
+            done[c[ends]] = True
+            flush(done, (n_done + k_last)[ends])
+            compact(~done)
+
+    quantum = record_every if history else 1
+    n_steps = 0
+    latest = n_total    # first step at which a lane that skipped ahead may run out of time
+    for step in range(n_total):
+        if step % FAST_CHECK_EVERY == 0 and idx.size:
+            closed_form(step, launch=step == 0)
+            any_burning = bool(burning.any())
+            latest = n_total - int(offset.max(initial=0))
+        if idx.size == 0:
+            break
+
+        drag_force = drag * density_ratio(altitude) * velocity * np.abs(velocity)
+        if any_burning:
+            acceleration = (thrust * burning - drag_force) / mass - GRAVITY
+        else:
+            acceleration = -drag_force / mass - GRAVITY
+        velocity += acceleration * dt
+        altitude += velocity * dt
+
+        if any_burning:
+            burn = np.minimum(burn_step, fuel_mass) * burning
+            fuel_mass -= burn
+            mass -= burn
+            out = burning & (fuel_mass <= 0)
+            if out.any():
+                burnout_time[idx[out]] = (step + 1 + offset[out]) * dt
+                burning &= ~out
+                any_burning = bool(burning.any())
+
+        landed = altitude < 0
+        if landed.any():
+            flush(landed, n_steps + offset[landed])
+            keep = ~landed
+            acceleration = acceleration[keep]
+            compact(keep)
+            any_burning = bool(burning.any())
+            if idx.size == 0:
+                break
+
+        n_steps = step + 1
+        np.maximum(run_alt, altitude, out=run_alt)
+        np.maximum(run_vel, velocity, out=run_vel)
+        np.maximum(run_acc, acceleration, out=run_acc)
+        if history and n_steps % record_every == 0:
+            row = n_steps // record_every - 1
+            if latest < n_total:
+                row = row + offset // record_every
+            top = int(np.max(row)) + 1
+            if top > hist.shape[1]:
+                grow = max(top - hist.shape[1], hist.shape[1], HISTORY_BLOCK)
+                hist = np.concatenate([hist, np.full((3, grow, n_lanes), np.nan, dtype=history_dtype)], axis=1)
+            if latest == n_total and idx.size == n_lanes:
+                hist[:, row] = altitude, velocity, acceleration
+            else:
+                hist[:, row, idx] = altitude, velocity, acceleration
+        if n_steps >= latest:
+            timed_out = n_steps + offset >= n_total
+            if timed_out.any():
+                flush(timed_out, n_total)
+                compact(~timed_out)
+    if idx.size:
+        flush(np.ones(idx.size, dtype=bool), n_steps + offset)
+
+    # Lanes that never left the pad report zeros rather than -inf
+    grounded = steps == 0
+    for arr in (max_altitude, max_velocity, peak_accel):
+        arr[grounded] = 0.0
+
+    result = {
+        "steps": steps,
+        "flight_time": steps * dt,
+        "burnout_time": burnout_time,
+        "max_altitude": max_altitude,
+        "max_velocity": max_velocity,
+        "peak_accel": peak_accel,
+    }
+    if history:
+        n_rows = (int(steps.max()) if n_lanes else 0) // record_every
+        if n_rows > hist.shape[1]:
+            hist = np.concatenate([hist, np.full((3, n_rows - hist.shape[1], n_lanes), np.nan, dtype=history_dtype)], axis=1)
+        hist = hist[:, :n_rows]
+        for lanes, n_done, k_last, *seg in segments:
+            # One (row, lane) pair for every sample that falls inside a lane's segment
+            first = n_done // record_every
+            counts = np.maximum((n_done + k_last.astype(np.int64)) // record_every - first, 0)
+            lane = np.repeat(np.arange(lanes.size), counts)
+            row = first[lane] + np.arange(lane.size) - np.repeat(np.cumsum(counts) - counts, counts)
+            k = (row + 1) * record_every - n_done[lane]
+            hist[:, row, lanes[lane]] = _ballistic(k, *(x[lane] for x in seg), dt)
+        result["time"] = (np.arange(n_rows) + 1) * record_every * dt
+        result["altitude"] = hist[0].T
+        result["velocity"] = hist[1].T
+        result["accel"] = hist[2].T
+    return result
+
+
+def sweep(x_name, x_values, y_name, y_values, base):
+    """Evaluate a rectangular grid over two launch parameters in a single batch.
+
+    ``base`` maps payload/thrust/fuel/drag to their fixed values; the ``x_name``
+    and ``y_name`` entries are replaced by the grid axes. Summary arrays come
+    back shaped ``(len(y_values), len(x_values))`` ready for a heatmap.
+    """
+    params = dict(base)
+    params[x_name] = np.asarray(x_values, dtype=np.float64)[None, :]
+    params[y_name] = np.asarray(y_values, dtype=np.float64)[:, None]
+    result = simulate_batch(**params, history=False)
+    shape = (len(y_values), len(x_values))
+    return {key: value.reshape(shape) for key, value in result.items()}
+
+
+# ─── Monte Carlo dispersion ───────────────────────────────────────────────────
+PARAMS = ("payload", "thrust", "fuel", "drag")
+DISTRIBUTIONS = ("normal", "uniform")
+PERCENTILES = (5, 50, 95)
+
+
+def sample_parameters(rng, nominal, spreads, n):
+    """Draw ``n`` perturbed parameter sets around ``nominal``.
+
+    ``spreads`` maps a parameter name to ``(distribution, fraction)``: a normal
+    with sigma ``fraction * nominal`` or a uniform over ``nominal * (1 ± fraction)``.
+    Parameters without a spread stay at their nominal value; draws are clipped at zero.
+    """
+    samples = {}
+    for name in PARAMS:
+        value = float(nominal[name])
+        dist, fraction = spreads.get(name, ("normal", 0.0))
+        if fraction <= 0:
+            samples[name] = np.full(n, value)
+        elif dist == "normal":
+            samples[name] = np.maximum(rng.normal(value, fraction * value, n), 0.0)
+        elif dist == "uniform":
+            samples[name] = np.maximum(rng.uniform(value * (1 - fraction), value * (1 + fraction), n), 0.0)
+        else:
+            raise ValueError(f"unknown distribution {dist!r}; expected one of {DISTRIBUTIONS}")
+    return samples
+
+
+def _dispersion_chunk(seed, n, nominal, spreads, record_every):
+    # Runs in a worker process: one independent RNG stream per chunk
+    samples = sample_parameters(np.random.default_rng(seed), nominal, spreads, n)
+    sim = simulate_batch(**samples, record_every=record_every, history_dtype=np.float32)
+    return samples, sim
+
+
+def monte_carlo(nominal, spreads, n_runs, seed=0, workers=None, chunk_size=2000, record_every=20):
+    """Fly ``n_runs`` perturbed launches and summarise their spread.
+
+    Runs are split into fixed-size chunks, each with its own stream spawned from
+    ``SeedSequence(seed)``, so results depend only on the seed and not on how many
+    workers share the load. Chunks are batched simulations on a process pool.
+    Returns P5/P50/P95 altitude and velocity bands on a common time grid (landed
+    rockets count as at rest on the ground) plus per-run apogees and flight times.
+    """
+    n_chunks = -(-n_runs // chunk_size)
+    sizes = [min(chunk_size, n_runs - i * chunk_size) for i in range(n_chunks)]
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    jobs = [(s, n, dict(nominal), dict(spreads), record_every) for s, n in zip(seeds, sizes)]
+
+    if workers == 1 or n_chunks == 1:
+        chunks = [_dispersion_chunk(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_dispersion_chunk, *zip(*jobs)))
+
+    n_rows = max(sim["altitude"].shape[1] for _, sim in chunks)
+    altitude = np.zeros((n_runs, n_rows), dtype=np.float32)
+    velocity = np.zeros((n_runs, n_rows), dtype=np.float32)
+    row = 0
+    for _, sim in chunks:
+        n, k = sim["altitude"].shape
+        altitude[row:row + n, :k] = np.nan_to_num(sim["altitude"], nan=0.0)
+        velocity[row:row + n, :k] = np.nan_to_num(sim["velocity"], nan=0.0)
+        row += n
+
+    return {
+        "time": (np.arange(n_rows) + 1) * record_every * DT,
+        "altitude_bands": np.percentile(altitude, PERCENTILES, axis=0),
+        "velocity_bands": np.percentile(velocity, PERCENTILES, axis=0),
+        "apogee": np.concatenate([sim["max_altitude"] for _, sim in chunks]),
+        "flight_time": np.concatenate([sim["flight_time"] for _, sim in chunks]),
+        "samples": {name: np.concatenate([samples[name] for samples, _ in chunks]) for name in PARAMS},
+    }
+
+
+# ─── Adaptive integrator ──────────────────────────────────────────────────────
+# Dormand–Prince 5(4) tableau with its free fourth-order dense output
+RTOL = 1e-6
+ATOL = 1e-3
+
+_DP_A = np.array([
+    [0, 0, 0, 0, 0],
+    [1/5, 0, 0, 0, 0],
+    [3/40, 9/40, 0, 0, 0],
+    [44/45, -56/15, 32/9, 0, 0],
+    [19372/6561, -25360/2187, 64448/6561, -212/729, 0],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+])
+_DP_B = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84])
+_DP_E = np.array([-71/57600, 0, 71/16695, -71/1920, 17253/339200, -22/525, 1/40])
+_DP_P = np.array([
+    [1, -8048581381/2820520608, 8663915743/2820520608, -12715105075/11282082432],
+    [0, 0, 0, 0],
+    [0, 131558114200/32700410799, -68118460800/10900136933, 87487479700/32700410799],
+    [0, -1754552775/470086768, 14199869525/1410260304, -10690763975/1880347072],
+    [0, 127303824393/49829197408, -318862633887/49829197408, 701980252875/199316789632],
+    [0, -282668133/205662961, 2019193451/616988883, -1453857185/822651844],
+    [0, 40617522/29380423, -110615467/29380423, 69997945/29380423],
+])
+
+# Events are local maxima (value crosses zero from + to -) of these quantities;
+# "impact" is the only terminal one.
+EVENTS = ("max_q", "max_velocity", "apogee", "impact")
+
+
+def _derivatives(y, thrust, drag, burning):
+    altitude, velocity, mass = y
+    drag_force = drag * density_ratio(altitude) * velocity * abs(velocity)
+    accel = ((thrust if burning else 0.0) - drag_force) / mass - GRAVITY
+    return np.array([velocity, accel, -thrust * BURN_RATE if burning else 0.0])
+
+
+def _event_values(y, f, target=None):
+    # max_q: q ∝ ρ(h)·v², so dq/dt has the sign of v·(ρ'·v² + 2ρ·a)
+    q_rate = f[0] * (density_gradient(y[0]) * f[0] ** 2 + 2 * density_ratio(y[0]) * f[1])
+    values = (q_rate, f[1], f[0], y[0])
+    if target is None:
+        return values
+    quantity, level = target
+    return values + (level - (y[0] if quantity == "altitude" else y[1]),)
+
+
+def _dp_step(fun, y, f, h):
+    K = np.empty((7, y.size))
+    K[0] = f
+    for s in range(1, 6):
+        K[s] = fun(y + h * (_DP_A[s, :s] @ K[:s]))
+    y_new = y + h * (_DP_B @ K[:6])
+    K[6] = fun(y_new)
+    return y_new, K, h * (_DP_E @ K)
+
+
+def _dense(y0, h, Q, x):
+    return y0 + h * (Q @ (x ** np.arange(1, 5)))
+
+
+def _find_root(g, lo, hi, g_lo, g_hi, tol=1e-12):
+    # Illinois false position on the step's dense output
+    side = 0
+    for _ in range(100):
+        x = (lo * g_hi - hi * g_lo) / (g_hi - g_lo)
+        g_x = g(x)
+        if g_x > 0:
+            lo, g_lo = x, g_x
+            if side == -1:
+                g_hi /= 2
+            side = -1
+        else:
+            hi, g_hi = x, g_x
+            if side == 1:
+                g_lo /= 2
+            side = 1
+        if hi - lo < tol:
+            break
+    return hi
+
+
+def simulate_adaptive(payload, thrust, fuel, drag, rtol=RTOL, atol=ATOL, sample_dt=None, max_steps=100000, target=None):
+    """Integrate one launch with error-controlled Dormand–Prince steps until ground impact.
+
+    Burnout is a phase boundary at the exact time the fuel runs out; max-Q, max
+    velocity, apogee and ground impact are located by root-finding on each step's
+    dense output, so none of them snap to a time grid and there is no time cap.
+    Steps grow during smooth coasting and shrink near events. Series are returned
+    at the accepted step nodes, or on a uniform ``sample_dt`` grid (plus the event
+    times) when given.
+
+    ``target=("altitude" | "velocity", level)`` turns the run into a pass/fail
+    check that stops as soon as the outcome is known: when the quantity first
+    reaches ``level`` (``reached`` is True), or at apogee for an altitude target
+    and burnout for a velocity target, after which neither can rise any further.
+    A long coast step can climb through the level and fall back below it, so the
+    apogee and max-velocity roots count as reaching the target too.
+    """
+    payload, thrust, fuel, drag = float(payload), float(thrust), float(fuel), float(drag)
+    mass0 = DRY_MASS + payload + fuel
+    t_burn = fuel / (thrust * BURN_RATE) if thrust > 0 and fuel > 0 else 0.0
+    y = np.array([0.0, 0.0, mass0])
+
+    result = {
+        "steps": 0, "rejected": 0, "flight_time": 0.0, "reached": False, "stopped_by": None,
+        "burnout_time": float("nan"), "max_altitude": 0.0, "max_velocity": 0.0, "peak_accel": 0.0,
+        "events": {},
+    }
+    # Thrust-to-weight at or below 1: the vehicle never leaves the pad
+    if t_burn == 0 or thrust <= mass0 * GRAVITY:
+        empty = np.zeros(0)
+        result.update(time=empty, altitude=empty, velocity=empty, accel=empty)
+        return result
+
+    events = result["events"]
+    names = EVENTS + (("target",) if target else ())
+    terminal = {"impact", "target", "apogee"} if target and target[0] == "altitude" else {"impact", "target"}
+    node_t, node_y, node_f = [0.0], [y], []
+    segments = []   # (t0, h, y0, Q)
+    t = 0.0
+    h = min(1.0, t_burn)
+    f_left = None
+    stop = None
+
+    for burning, t_end in ((True, t_burn), (False, np.inf)):
+        fun = lambda state, burning=burning: _derivatives(state, thrust, drag, burning)
+        f = fun(y)
+        g = _event_values(y, f, target)
+        if f_left is None:
+            node_f.append(f)
+        else:
+            # The thrust cut-off is a jump in acceleration: an event whose quantity
+            # starts falling exactly at burnout is located at the boundary itself.
+            events["burnout"] = (t, float(y[0]), float(y[1]))
+            g_left = _event_values(y, f_left, target)
+            for name, a, b in zip(EVENTS, g_left, g):
+                if a > 0 >= b:
+                    events.setdefault(name, []).append((t, float(y[0]), float(y[1])))
+            # Keep the burnout node's pre-cut-off acceleration for the peak
+            node_f[-1] = f_left
+            if target and target[0] == "velocity":
+                stop = "burnout"
+                break
+
+        while t < t_end and stop is None:
+            if result["steps"] + result["rejected"] >= max_steps:
+                raise RuntimeError(f"adaptive integrator exceeded {max_steps} steps")
+            h = min(h, t_end - t)
+            y_new, K, err = _dp_step(fun, y, f, h)
+            scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+            err_norm = float(np.sqrt(np.mean((err / scale) ** 2)))
+            if err_norm > 1:
+                h *= max(0.2, 0.9 * err_norm ** -0.2)
+                result["rejected"] += 1
+                continue
+
+            Q = K.T @ _DP_P
+            f_new = K[6]
+            g_new = _event_values(y_new, f_new, target)
+            x_end = 1.0
+            crossings = []
+            for i, name in enumerate(names):
+                if g[i] > 0 >= g_new[i]:
+                    value = lambda x, i=i: _event_values(_dense(y, h, Q, x), fun(_dense(y, h, Q, x)), target)[i]
+                    crossings.append((_find_root(value, 0.0, 1.0, g[i], g_new[i]), name))
+            # Handle crossings in time order; the first terminal one truncates the step
+            for x, name in sorted(crossings):
+                y_x = _dense(y, h, Q, x)
+                if name == "impact":
+                    y_x[0] = 0.0
+                if name != "target":
+                    events.setdefault(name, []).append((t + x * h, float(y_x[0]), float(y_x[1])))
+                if name in terminal:
+                    x_end, stop = x, name
+                    y_new = y_x
+                    f_new = fun(y_new)
+                    g_new = _event_values(y_new, f_new, target)
+                    break
+
+            segments.append((t, h, y, Q))
+            result["steps"] += 1
+            t += x_end * h
+            y, f, g = y_new, f_new, g_new
+            node_t.append(t)
+            node_y.append(y)
+            node_f.append(f)
+            h *= min(10.0, 0.9 * err_norm ** -0.2) if err_norm > 0 else 10.0
+        f_left = f
+        if stop:
+            break
+
+    # Only the highest of several local maxima is reported
+    for name in ("max_q", "max_velocity"):
+        if name in events:
+            events[name] = max(events[name], key=lambda e: abs(e[2]))
+    for name in ("apogee", "impact"):
+        if name in events:
+            events[name] = events[name][0]
+    result["stopped_by"] = stop
+
+    node_t = np.array(node_t)
+    node_y = np.array(node_y).T
+    node_f = np.array(node_f).T
+    result["flight_time"] = t
+    result["burnout_time"] = t_burn
+    result["max_altitude"] = float(events["apogee"][1]) if "apogee" in events else float(node_y[0].max())
+    peaks = [e[2] for name, e in events.items() if name in ("max_velocity", "burnout")]
+    result["max_velocity"] = float(max([node_y[1].max()] + peaks))
+    result["peak_accel"] = float(node_f[1].max())
+    if target:
+        quantity, level = target
+        result["reached"] = stop == "target" or result[f"max_{quantity}"] >= level
+
+    if sample_dt is None:
+        result.update(time=node_t, altitude=node_y[0], velocity=node_y[1], accel=node_f[1])
+        return result
+
+    # Event times join the uniform grid so peaks are samples, not interpolated guesses
+    event_times = [e[0] for e in events.values()]
+    times = np.unique(np.concatenate([np.arange(sample_dt, t, sample_dt), event_times, [t]]))
+    seg_t0 = np.array([s[0] for s in segments])
+    seg = np.clip(np.searchsorted(seg_t0, times, side="right") - 1, 0, len(segments) - 1)
+    seg_h = np.array([s[1] for s in segments])[seg]
+    seg_y0 = np.array([s[2] for s in segments])[seg]
+    seg_Q = np.array([s[3] for s in segments])[seg]
+    x = (times - seg_t0[seg]) / seg_h
+    states = seg_y0 + seg_h[:, None] * np.einsum("sij,sj->si", seg_Q, x[:, None] ** np.arange(1, 5))
+    altitude, velocity, mass = states.T
+    burning = times <= t_burn
+    accel = (thrust * burning - drag * density_ratio(altitude) * velocity * np.abs(velocity)) / mass - GRAVITY
+    result.update(time=times, altitude=np.maximum(altitude, 0.0), velocity=velocity, accel=accel)
+    return result
+
+
+# ─── Inverse solver ───────────────────────────────────────────────────────────
+def solve_minimum(param, quantity, level, base, lo, hi, scan=8, xtol=None, rtol=RTOL, atol=ATOL):
+    """Smallest value of ``param`` in ``[lo, hi]`` whose flight reaches ``level``.
+
+    ``quantity`` is "altitude" or "velocity" and ``base`` holds the other three
+    launch parameters. Every evaluation is an early-terminating pass/fail run of
+    the adaptive integrator. A coarse scan from ``lo`` upwards brackets the first
+    passing value, which keeps the search honest when the response is not
+    monotone (extra fuel eventually makes the rocket too heavy to climb), then
+    bisection narrows the bracket to ``xtol`` (default 0.1% of the range).
+    Returns the value, or None if nothing in range reaches the target, with
+    the number of simulations used.
+    """
+    xtol = (hi - lo) * 1e-3 if xtol is None else xtol
+    evaluations = 0
+
+    def reaches(value):
+        nonlocal evaluations
+        evaluations += 1
+        params = dict(base, **{param: value})
+        return simulate_adaptive(**params, rtol=rtol, atol=atol, target=(quantity, level))["reached"]
+
+    if reaches(lo):
+        return {"value": float(lo), "evaluations": evaluations}
+    below = lo
+    for value in np.linspace(lo, hi, scan + 1)[1:]:
+        if reaches(value):
+            above = value
+            break
+        below = value
+    else:
+        return {"value": None, "evaluations": evaluations}
+
+    while above - below > xtol:
+        mid = 0.5 * (below + above)
+        if reaches(mid):
+            above = mid
+        else:
+            below = mid
+    return {"value": float(above), "evaluations": evaluations}
+
+
+# ─── Sensitivity ──────────────────────────────────────────────────────────────
+SENSITIVITY_METRICS = ("max_altitude", "max_velocity", "flight_time")
+
+
+def sensitivity(base, rel_step=0.05, dt=DT):
+    """Central finite differences of the summary metrics around ``base`` in one batch.
+
+    Lane 0 flies ``base``; lanes ``2i + 1`` and ``2i + 2`` scale ``PARAMS[i]`` by
+    ``1 - rel_step`` and ``1 + rel_step``, all in a single ``simulate_batch``
+    call. The nominal is that batch's own fixed-step value, so it can differ
+    slightly from ``simulate_adaptive(**base)``; every lane shares the step, so
+    the differences are consistent. For each metric the result holds the
+    nominal value and arrays ordered like ``PARAMS``: the low and high runs, the
+    partial derivative and the elasticity (percent change in the metric per
+    percent change in the parameter).
+    """
+    n_params = len(PARAMS)
+    nominal = np.array([float(base[name]) for name in PARAMS])
+    lanes = np.repeat(nominal[:, None], 1 + 2 * n_params, axis=1)
+    idx = np.arange(n_params)
+    lanes[idx, 2 * idx + 1] *= 1 - rel_step
+    lanes[idx, 2 * idx + 2] *= 1 + rel_step
+    sim = simulate_batch(*lanes, dt=dt, history=False)
+
+    span = 2 * rel_step * nominal
+    out = {"rel_step": rel_step}
+    for key in SENSITIVITY_METRICS:
+        center, low, high = sim[key][0], sim[key][1::2], sim[key][2::2]
+        derivative = np.divide(high - low, span, out=np.zeros(n_params), where=span != 0)
+        elasticity = derivative * nominal / center if center else np.zeros(n_params)
+        out[key] = {"nominal": float(center), "low": low, "high": high,
+                    "derivative": derivative, "elasticity": elasticity}
+    return out
+
+
+# ─── Trajectory storage ───────────────────────────────────────────────────────
+class Trajectory:
+    """One flight's series in a single contiguous ``(4, n)`` array.
+
+    Rows are time, altitude, velocity and acceleration, stored as float32 by
+    default (16 bytes per sample instead of four boxed floats in four lists).
+    Summary metrics are reductions over the rows; values are only rounded when
+    formatted for display.
+    """
+
+    __slots__ = ("data", "events")
+
+    def __init__(self, time, altitude, velocity, accel, events=None, dtype=np.float32):
+        self.data = np.array([time, altitude, velocity, accel], dtype=dtype).reshape(4, -1)
+        self.data.flags.writeable = False
+        self.events = dict(events or {})
+
+    @classmethod
+    def from_result(cls, result, dtype=np.float32):
+        return cls(result["time"], result["altitude"], result["velocity"], result["accel"],
+                   events=result.get("events"), dtype=dtype)
+
+    time = property(lambda self: self.data[0])
+    altitude = property(lambda self: self.data[1])
+    velocity = property(lambda self: self.data[2])
+    accel = property(lambda self: self.data[3])
+
+    def __len__(self):
+        return self.data.shape[1]
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    @property
+    def max_altitude(self):
+        return float(self.altitude.max(initial=0.0))
+
+    @property
+    def max_velocity(self):
+        return float(self.velocity.max(initial=0.0))
+
+    @property
+    def peak_accel(self):
+        return float(self.accel.max(initial=0.0))
+
+    @property
+    def flight_time(self):
+        return float(self.time[-1]) if len(self) else 0.0